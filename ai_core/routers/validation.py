@@ -154,7 +154,9 @@ async def validate_model(request: ValidateModelRequest):
             include_stability_test=request.include_stability_test
         )
 
-        validation_summary = extract_validation_summary(validation_result["results"])
+        validation_summary = extract_validation_summary(
+            validation_result["results"], validation_result.get("risk_scores")
+        )
 
         # Step 3: Compute fairness metrics
         logger.info("Computing fairness metrics...")
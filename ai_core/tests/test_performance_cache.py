@@ -0,0 +1,38 @@
+import time
+
+from ai_core.utils.performance import PerformanceCache
+
+
+def test_get_returns_value_before_expiry():
+    cache = PerformanceCache(ttl_seconds=60)
+    cache.set("k", {"v": 1})
+    assert cache.get("k") == {"v": 1}
+    assert cache.get("missing") is None
+
+
+def test_get_drops_expired_entry():
+    cache = PerformanceCache(ttl_seconds=60)
+    cache.set("k", 1)
+    # Backdate the entry past the TTL
+    cache._ts["k"] = time.time() - 120
+    assert cache.get("k") is None
+    assert "k" not in cache._values
+    assert "k" not in cache._ts
+
+
+def test_cleanup_expired_keeps_fresh_entries():
+    cache = PerformanceCache(ttl_seconds=60)
+    cache.set("old", 1)
+    cache.set("new", 2)
+    cache._ts["old"] = time.time() - 120
+    cache.cleanup_expired()
+    assert list(cache._values) == ["new"]
+    assert list(cache._ts) == ["new"]
+
+
+def test_batch_process_handles_sequences_and_iterators():
+    from ai_core.utils.performance import batch_process
+
+    assert list(batch_process(list(range(5)), batch_size=2)) == [[0, 1], [2, 3], [4]]
+    assert list(batch_process(iter(range(5)), batch_size=2)) == [[0, 1], [2, 3], [4]]
+    assert list(batch_process([], batch_size=2)) == []
@@ -0,0 +1,152 @@
+import pytest
+
+from ai_core.validation.metrics import (
+    calculate_all_metrics,
+    calculate_consistency_score,
+    calculate_demographic_parity,
+    calculate_disparate_impact,
+    calculate_equal_opportunity,
+    calculate_rule_violation_severity,
+    calculate_stability_score,
+)
+
+
+def _result(gender, risk_level, risk_score=20.0, income=60000, credit=700, rules=()):
+    return {
+        "input": {
+            "applicant": {"gender": gender},
+            "financial": {"annual_income": income, "credit_score": credit},
+        },
+        "output": {"risk_score": risk_score, "risk_level": risk_level, "triggered_rules": list(rules)},
+    }
+
+
+def test_disparate_impact_ratio_of_approval_rates():
+    results = (
+        [_result("male", "low")] * 4
+        + [_result("female", "low")] * 2
+        + [_result("female", "high")] * 2
+    )
+    metric = calculate_disparate_impact(results, "gender")
+    assert metric["score"] == pytest.approx(0.5)
+    assert metric["level"] == "critical"
+    assert metric["details"]["approval_rates_by_group"] == {"female": 0.5, "male": 1.0}
+
+
+def test_disparate_impact_single_group_is_acceptable():
+    metric = calculate_disparate_impact([_result("male", "low")] * 3, "gender")
+    assert metric["score"] == 1.0
+    assert metric["level"] == "acceptable"
+    assert metric["details"] == {}
+
+
+def test_equal_opportunity_ignores_unqualified_applicants():
+    results = (
+        [_result("male", "low")] * 2
+        + [_result("female", "low")] * 2
+        # Unqualified (low credit) denials must not affect TPR
+        + [_result("female", "high", credit=500)] * 5
+    )
+    metric = calculate_equal_opportunity(results, "gender")
+    assert metric["score"] == pytest.approx(1.0)
+    assert metric["details"]["tpr_by_group"] == {"female": 1.0, "male": 1.0}
+
+
+def test_demographic_parity_gap():
+    results = (
+        [_result("male", "low")] * 3
+        + [_result("male", "high")]
+        + [_result("female", "low")]
+        + [_result("female", "high")] * 3
+    )
+    metric = calculate_demographic_parity(results, "gender")
+    assert metric["score"] == pytest.approx(0.5)
+    assert metric["level"] == "critical"
+
+
+def test_consistency_uses_profiles_with_three_or_more_members():
+    results = [_result("male", "low", risk_score=s) for s in (10.0, 20.0, 30.0)]
+    # A two-member profile is skipped
+    results += [_result("male", "low", risk_score=s, income=140000) for s in (0.0, 90.0)]
+    metric = calculate_consistency_score(results)
+    assert metric["details"]["avg_variance"] == pytest.approx(100.0)
+    assert metric["details"]["profile_count"] == 2
+    assert metric["details"]["analyzed_profiles"] == 1
+
+
+def test_stability_counts_level_changes():
+    original = [_result("male", "low", risk_score=10.0)] * 4
+    noisy = [_result("male", "low", risk_score=12.0)] * 3 + [_result("male", "high", risk_score=14.0)]
+    metric = calculate_stability_score(original, noisy)
+    assert metric["details"]["avg_score_difference"] == pytest.approx(2.5)
+    assert metric["details"]["level_changes"] == 1
+    assert metric["level"] == "warning"
+
+
+def test_rule_violation_counts_by_rule():
+    results = [
+        _result("male", "high", rules=("r1", "r2")),
+        _result("male", "low", rules=("r1",)),
+        _result("male", "low"),
+        _result("male", "low"),
+    ]
+    metric = calculate_rule_violation_severity(results)
+    assert metric["details"]["violations_by_rule"] == {"r1": 2, "r2": 1}
+    assert metric["details"]["high_risk_count"] == 1
+    assert metric["details"]["violation_rate"] == pytest.approx(0.75)
+
+
+def test_all_metrics_summary_counts():
+    results = [_result("male", "low")] * 5 + [_result("female", "high")] * 5
+    summary = calculate_all_metrics(results, results)
+    metrics = summary["metrics"]
+    assert "stability" in metrics
+    assert summary["critical_metrics"] == sum(1 for m in metrics.values() if m["level"] == "critical")
+    assert summary["overall_level"] == "critical"
+    assert (
+        summary["critical_metrics"] + summary["warning_metrics"] + summary["acceptable_metrics"]
+        == len(metrics)
+    )
+
+
+def test_pandas_group_stats_match_bincount_path(monkeypatch):
+    from ai_core.validation import metrics as metrics_mod
+
+    results = (
+        [_result("male", "low")] * 3
+        + [_result("male", "high", credit=500)] * 2
+        + [_result("female", "low", credit=500)] * 2
+        + [_result("female", "high")] * 4
+        + [_result("", "low")]
+        + [_result("non-binary", "high", credit=500)]
+    )
+    expected = calculate_all_metrics(results)
+    monkeypatch.setattr(metrics_mod, "PANDAS_MIN_RESULTS", 0)
+    assert calculate_all_metrics(results) == expected
+
+
+@pytest.mark.parametrize("pandas_min_results", [None, 0])
+def test_mixed_type_groups_keep_first_seen_order(monkeypatch, pandas_min_results):
+    from ai_core.validation import metrics as metrics_mod
+
+    if pandas_min_results is not None:
+        monkeypatch.setattr(metrics_mod, "PANDAS_MIN_RESULTS", pandas_min_results)
+    results = [_result("male", "low"), _result(2, "high"), _result("female", "low"), _result(2, "low")]
+    rates = calculate_all_metrics(results)["metrics"]["disparate_impact_gender"]["details"]["approval_rates_by_group"]
+    assert list(rates.items()) == [("male", 1.0), (2, 0.5), ("female", 1.0)]
+
+
+def test_consistency_sampling_caps_each_profile(monkeypatch):
+    from ai_core.validation import metrics as metrics_mod
+
+    monkeypatch.setattr(metrics_mod, "SAMPLING_MIN_RESULTS", 0)
+    monkeypatch.setattr(metrics_mod, "PROFILE_SAMPLE_CAP", 4)
+    results = [_result("male", "low", risk_score=float(s % 7)) for s in range(40)]
+    results += [_result("male", "low", risk_score=5.0, income=140000)] * 10
+
+    metric = calculate_consistency_score(results)
+    assert metric["details"]["sampled_per_profile"] == 4
+    assert metric["details"]["profile_count"] == 2
+    assert metric["details"]["analyzed_profiles"] == 2
+    # Seeded sampling is deterministic
+    assert calculate_consistency_score(results) == metric
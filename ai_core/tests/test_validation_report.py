@@ -0,0 +1,76 @@
+import json
+
+from ai_core.validation import report as report_mod
+from ai_core.validation.report import export_report_json, generate_validation_report
+
+
+def _metrics():
+    return {
+        "overall_fairness_score": 72.5,
+        "metrics": [
+            {"metric": "disparate_impact", "score": 0.55, "level": "critical", "explanation": "ratio low"},
+            {"metric": "consistency", "score": 0.5, "level": "warning", "explanation": "some variance"},
+            {"metric": "stability", "score": 1.0, "level": "acceptable", "explanation": "stable"},
+        ],
+    }
+
+
+def _report(include_html=False):
+    return generate_validation_report(
+        model_metadata={"name": "loan-model", "version": "2.0"},
+        synthetic_stats={"total_cases": 200, "edge_cases": 20, "distribution": {"gender": {"male": 100}}},
+        metrics=_metrics(),
+        validation_summary={"successful_evaluations": 200, "avg_risk_score": 45.0},
+        include_html=include_html,
+    )
+
+
+def test_report_status_and_recommendations():
+    report = _report()
+    assert report["status"] == "fail"
+    assert report["recommendations"][0].startswith("CRITICAL: Disparate impact score 0.55")
+    assert report["recommendations"][1].startswith("WARNING: Consistency score 0.50")
+    assert report["report_json"]["report_id"].startswith("val-")
+
+
+def test_export_report_json_hoists_metrics(tmp_path):
+    report = _report()
+    path = tmp_path / "report.json"
+    export_report_json(report, str(path))
+    exported = json.loads(path.read_text())
+    assert exported["fairness_metrics"] == {"overall_score": 72.5}
+    assert exported["metrics"] == report["report_json"]["fairness_metrics"]["metrics"]
+    assert exported["report_id"] == report["report_json"]["report_id"]
+    # In-memory report keeps the nested form
+    assert "metrics" in report["report_json"]["fairness_metrics"]
+
+
+def test_export_report_json_stdlib_fallback(tmp_path, monkeypatch):
+    monkeypatch.setattr(report_mod, "orjson", None)
+    report = _report()
+    path = tmp_path / "report.json"
+    export_report_json(report, str(path))
+    assert json.loads(path.read_text()) == report_mod._flatten_for_export(report["report_json"])
+
+
+def test_html_report_renders_metrics_and_escapes_text():
+    report = _report(include_html=True)
+    html = report["report_html"]
+    assert "<td style=\"padding: 12px; border-bottom: 1px solid #e5e7eb;\">0.55</td>" in html
+    assert "CRITICAL" in html and "FAIL" in html
+    assert "background: #ef4444" in html
+
+    metrics = _metrics()
+    metrics["metrics"][0]["explanation"] = "<script>x</script>"
+    report = generate_validation_report({}, {}, metrics, {}, include_html=True)
+    assert "<script>" not in report["report_html"]
+
+
+def test_export_report_html_renders_on_demand(tmp_path):
+    from ai_core.validation.report import export_report_html
+
+    report = _report()
+    assert "report_html" not in report
+    path = tmp_path / "report.html"
+    export_report_html(report, str(path))
+    assert path.read_text() == report_mod._generate_html_report(report["report_json"])
@@ -0,0 +1,95 @@
+import copy
+
+from ai_core.validation.validator import _add_noise_to_cases, extract_validation_summary, run_validation
+
+
+def _case(case_id=1):
+    return {
+        "case_id": case_id,
+        "applicant": {"gender": "female", "age": 40},
+        "financial": {"annual_income": 60000, "existing_debt": 5000, "savings": 10000, "credit_score": 700},
+        "request": {"loan_amount": 20000},
+        "metadata": {"tags": ["regular"]},
+    }
+
+
+def _model(case):
+    score = case["financial"]["credit_score"] / 10
+    return {"risk_score": score, "risk_level": "low" if score >= 65 else "high", "triggered_rules": []}
+
+
+def test_add_noise_does_not_mutate_input():
+    case = _case()
+    original = copy.deepcopy(case)
+    noisy = _add_noise_to_cases([case])[0]
+    assert case == original
+    assert abs(noisy["financial"]["credit_score"] - 700) <= 5
+    assert 39 <= noisy["applicant"]["age"] <= 41
+    assert 0.95 * 60000 - 1 <= noisy["financial"]["annual_income"] <= 1.05 * 60000
+    assert type(noisy["financial"]["credit_score"]) is int
+    # Untouched sections are shared, not copied
+    assert noisy["metadata"] is case["metadata"]
+
+
+def test_run_validation_preserves_case_order():
+    cases = [_case(i) for i in range(10)]
+    result = run_validation(_model, cases)
+    assert [r["case_id"] for r in result["results"]] == list(range(10))
+    assert [r["case_id"] for r in result["noisy_results"]] == list(range(10))
+    assert result["successful_evaluations"] == 10
+    assert result["stability_test_performed"] is True
+
+
+def test_run_validation_records_model_errors():
+    def failing(case):
+        raise RuntimeError("boom")
+
+    result = run_validation(failing, [_case()], include_stability_test=False)
+    assert result["failed_evaluations"] == 1
+    assert result["results"][0]["output"]["risk_level"] == "medium"
+
+
+def test_extract_validation_summary():
+    results = [
+        {"output": {"risk_score": 20, "risk_level": "low", "triggered_rules": ["a"]}},
+        {"output": {"risk_score": 80, "risk_level": "high", "triggered_rules": ["a", "b"]}},
+        {"output": {}},
+    ]
+    summary = extract_validation_summary(results)
+    assert summary["total"] == 3
+    assert summary["risk_distribution"] == {"low": 1, "medium": 1, "high": 1}
+    assert summary["triggered_rules_summary"] == {"a": 2, "b": 1}
+    assert summary["avg_risk_score"] == 50
+    assert summary["min_risk_score"] == 20
+    assert summary["max_risk_score"] == 80
+
+
+def test_run_validation_caches_duplicate_inputs():
+    calls = []
+
+    def counting(case):
+        calls.append(case["case_id"])
+        return _model(case)
+
+    cases = [_case(i) for i in range(5)]
+    result = run_validation(counting, cases, include_stability_test=False, max_workers=1)
+    assert len(calls) == 1
+    assert [r["case_id"] for r in result["results"]] == list(range(5))
+
+    calls.clear()
+    run_validation(counting, cases, include_stability_test=False, max_workers=1, enable_cache=False)
+    assert len(calls) == 5
+
+
+def test_extract_validation_summary_uses_precomputed_scores():
+    cases = [_case(i) for i in range(4)]
+    result = run_validation(_model, cases, include_stability_test=False)
+    assert result["risk_scores"].tolist() == [70.0] * 4
+    summary = extract_validation_summary(result["results"], result["risk_scores"])
+    assert summary == extract_validation_summary(result["results"])
+    assert summary["avg_risk_score"] == 70.0
+
+
+def test_add_noise_returns_case_without_noisy_fields():
+    case = {"case_id": 1, "applicant": {"gender": "male"}, "metadata": {}}
+    assert _add_noise_to_cases([case])[0] is case
@@ -4,7 +4,7 @@ Provides caching, batch processing, and optimization helpers
 """
 
 from functools import lru_cache, wraps
-from typing import Any, Callable, List, Dict
+from typing import Any, Callable, Dict, Iterable, Iterator, List
 import hashlib
 import json
 import time
@@ -15,7 +15,11 @@ class PerformanceCache:
     """Simple in-memory cache for expensive computations"""
 
     def __init__(self, ttl_seconds: int = 300):
-        self._cache: Dict[str, tuple[Any, float]] = {}
+        # Values and timestamps live in parallel dicts keyed identically, so
+        # `set` does not allocate a tuple per entry and expiry scans only
+        # touch the timestamps.
+        self._values: Dict[str, Any] = {}
+        self._ts: Dict[str, float] = {}
         self.ttl_seconds = ttl_seconds
 
     def _is_expired(self, timestamp: float) -> bool:
@@ -24,30 +28,32 @@ class PerformanceCache:
 
     def get(self, key: str) -> Any:
         """Get cached value if not expired"""
-        if key in self._cache:
-            value, timestamp = self._cache[key]
+        timestamp = self._ts.get(key)
+        if timestamp is not None:
             if not self._is_expired(timestamp):
-                return value
+                return self._values[key]
             else:
-                del self._cache[key]
+                del self._values[key]
+                del self._ts[key]
         return None
 
     def set(self, key: str, value: Any):
         """Set cache value with current timestamp"""
-        self._cache[key] = (value, time.time())
+        self._values[key] = value
+        self._ts[key] = time.time()
 
     def clear(self):
         """Clear all cache entries"""
-        self._cache.clear()
+        self._values.clear()
+        self._ts.clear()
 
     def cleanup_expired(self):
         """Remove expired entries"""
-        expired_keys = [
-            key for key, (_, timestamp) in self._cache.items()
-            if self._is_expired(timestamp)
-        ]
+        cutoff = time.time() - self.ttl_seconds
+        expired_keys = [key for key, timestamp in self._ts.items() if timestamp < cutoff]
         for key in expired_keys:
-            del self._cache[key]
+            self._values.pop(key, None)
+            self._ts.pop(key, None)
 
 
 # Global cache instance
@@ -94,12 +100,25 @@ def _create_cache_key(func_name: str, args: tuple, kwargs: dict) -> str:
         return f"{func_name}_{time.time()}"
 
 
-def batch_process(items: List[Any], batch_size: int = 50) -> List[List[Any]]:
-    """Split items into batches for efficient processing"""
-    batches = []
-    for i in range(0, len(items), batch_size):
-        batches.append(items[i:i + batch_size])
-    return batches
+def batch_process(items: Iterable[Any], batch_size: int = 50) -> Iterator[List[Any]]:
+    """Yield items in batches for efficient processing.
+
+    Sequences are sliced lazily; other iterables (cursors, streams) are
+    buffered one batch at a time.
+    """
+    if hasattr(items, '__len__') and hasattr(items, '__getitem__'):
+        for i in range(0, len(items), batch_size):
+            yield items[i:i + batch_size]
+        return
+
+    batch: List[Any] = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
 
 
 def optimize_dataframe_memory(df):
@@ -8,9 +8,377 @@ Calculates key fairness indicators:
 - Consistency Score
 - Stability Score
 - Rule violation severity
+
+numpy (and pandas/numba for large runs) are imported lazily inside the
+helpers that need them, so importing this module stays cheap.
 """
-from typing import List, Dict, Any
-import statistics
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from dataclasses import dataclass
+from itertools import chain
+from operator import itemgetter
+from typing import List, Dict, Any, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
+
+SENSITIVE_ATTRIBUTES = ("gender", "ethnicity")
+
+# C-level accessors for the two top-level sections of each result
+_get_input = itemgetter("input")
+_get_output = itemgetter("output")
+
+
+# Level bands: each metric bisects its value into a sorted threshold tuple
+# and reads the matching band. Lower-is-better metrics use bisect_left so a
+# value equal to a threshold stays in the better band.
+
+# Disparate impact: higher is better (bisect_right, ratio >= threshold)
+_DI_THRESHOLDS = (0.6, 0.8)
+_DI_BANDS = (
+    ("critical", "Disparate impact ratio {ratio:.2f} indicates significant disparity"),
+    ("warning", "Disparate impact ratio {ratio:.2f} below 80% threshold"),
+    ("acceptable", "Disparate impact ratio {ratio:.2f} meets 80% rule"),
+)
+
+# Equal opportunity difference / demographic parity gap
+_GAP_THRESHOLDS = (0.1, 0.2)
+_EO_BANDS = (
+    ("acceptable", "Equal opportunity difference {diff:.2f} is minimal"),
+    ("warning", "Equal opportunity difference {diff:.2f} shows disparity"),
+    ("critical", "Equal opportunity difference {diff:.2f} indicates significant bias"),
+)
+_DP_BANDS = (
+    ("acceptable", "Demographic parity gap {gap:.2f} is acceptable"),
+    ("warning", "Demographic parity gap {gap:.2f} shows imbalance"),
+    ("critical", "Demographic parity gap {gap:.2f} indicates significant disparity"),
+)
+
+# Consistency: average within-profile variance
+_CONSISTENCY_THRESHOLDS = (50, 150, 300)
+_CONSISTENCY_BANDS = (
+    (1.0, "acceptable", "Model is highly consistent (variance {variance:.1f})"),
+    (0.7, "acceptable", "Model shows acceptable consistency (variance {variance:.1f})"),
+    (0.5, "warning", "Model consistency is moderate (variance {variance:.1f})"),
+    (0.3, "critical", "Model shows high inconsistency (variance {variance:.1f})"),
+)
+
+# Stability: average score difference and level change rate
+_STABILITY_DIFF_THRESHOLDS = (5, 10, 20)
+_STABILITY_CHANGE_THRESHOLDS = (0.05, 0.15, 0.30)
+_STABILITY_BANDS = (
+    (1.0, "acceptable", "Model is highly stable (avg diff {diff:.1f}, {rate:.1%} level changes)"),
+    (0.8, "acceptable", "Model shows good stability (avg diff {diff:.1f}, {rate:.1%} level changes)"),
+    (0.6, "warning", "Model stability is moderate (avg diff {diff:.1f}, {rate:.1%} level changes)"),
+    (0.4, "critical", "Model is unstable (avg diff {diff:.1f}, {rate:.1%} level changes)"),
+)
+
+# Rule violations: violation rate and high-risk rate
+_VIOLATION_RATE_THRESHOLDS = (0.1, 0.25, 0.40)
+_HIGH_RISK_RATE_THRESHOLDS = (0.05, 0.15, 0.30)
+_VIOLATION_BANDS = (
+    (1.0, "acceptable", "Low violation rate ({violation_rate:.1%}), high-risk rate ({high_risk_rate:.1%})"),
+    (0.7, "acceptable", "Acceptable violation rate ({violation_rate:.1%}), high-risk rate ({high_risk_rate:.1%})"),
+    (0.5, "warning", "Moderate violation rate ({violation_rate:.1%}), high-risk rate ({high_risk_rate:.1%})"),
+    (0.3, "critical", "High violation rate ({violation_rate:.1%}), high-risk rate ({high_risk_rate:.1%})"),
+)
+
+
+@dataclass
+class _OutcomeColumns:
+    """Model outputs only: all the stability metric compares between runs"""
+    count: int
+    risk_level: np.ndarray
+    risk_score: np.ndarray
+
+
+@dataclass
+class _ResultColumns(_OutcomeColumns):
+    """Columnar view of validation results, shared by all metrics of one run"""
+    attributes: Dict[str, np.ndarray]  # sensitive attr -> values (None if missing)
+    credit: np.ndarray
+    income: np.ndarray
+    triggered_rules: List[List[str]]
+    low: np.ndarray  # approval == low risk
+    qualified: np.ndarray  # good credit + income
+
+
+def _extract_outcomes(results: List[Dict[str, Any]]) -> _OutcomeColumns:
+    """Extract only risk level and score, for the noisy side of stability."""
+    import numpy as np
+
+    n = len(results)
+    outputs = list(map(_get_output, results))
+    return _OutcomeColumns(
+        count=n,
+        risk_level=np.fromiter((output["risk_level"] for output in outputs), dtype=object, count=n),
+        risk_score=np.fromiter((output["risk_score"] for output in outputs), dtype=np.float64, count=n),
+    )
+
+
+def _extract_columns(results: List[Dict[str, Any]], sensitive_attrs=SENSITIVE_ATTRIBUTES) -> _ResultColumns:
+    """
+    Extract every field the metrics read into columnar arrays in one pass.
+
+    The pass fills plain lists and each column is converted to an array once
+    at the end. Missing or empty sensitive attribute values are stored as
+    None so they can be masked out. Shared masks (``low``, ``qualified``)
+    are derived once here instead of per metric.
+    """
+    import numpy as np
+
+    attr_lists = {attr: [] for attr in sensitive_attrs}
+    risk_level = []
+    risk_score = []
+    credit = []
+    income = []
+    triggered_rules = []
+
+    for result in results:
+        inp = _get_input(result)
+        output = _get_output(result)
+        applicant = inp.get("applicant", {})
+        financial = inp.get("financial", {})
+        for attr, values in attr_lists.items():
+            values.append(applicant.get(attr) or None)
+        risk_level.append(output["risk_level"])
+        risk_score.append(output["risk_score"])
+        credit.append(financial.get("credit_score", 0))
+        income.append(financial.get("annual_income", 0))
+        triggered_rules.append(output.get("triggered_rules", []))
+
+    # Credit scores and incomes are integral; fractional inputs truncate,
+    # which leaves the integer thresholds and bracket boundaries unchanged
+    n = len(risk_level)
+    risk_level = np.fromiter(risk_level, dtype=object, count=n)
+    credit = np.fromiter(credit, dtype=np.int32, count=n)
+    income = np.fromiter(income, dtype=np.int64, count=n)
+    return _ResultColumns(
+        count=n,
+        attributes={attr: np.fromiter(values, dtype=object, count=n) for attr, values in attr_lists.items()},
+        risk_level=risk_level,
+        risk_score=np.fromiter(risk_score, dtype=np.float64, count=n),
+        credit=credit,
+        income=income,
+        triggered_rules=triggered_rules,
+        low=risk_level == "low",
+        qualified=(credit >= 650) & (income >= 40000),
+    )
+
+
+def _group_codes(columns: _ResultColumns, sensitive_attr: str):
+    """
+    Return (present mask, group labels, per-row group index).
+
+    Groups are factorized with a dict, so labels keep first-seen order (as
+    the per-result dicts did) and any hashable value works, including
+    mixed types that np.unique cannot sort.
+    """
+    import numpy as np
+
+    attr_col = columns.attributes[sensitive_attr]
+    present = attr_col != None  # noqa: E711 - elementwise comparison
+    codes = {}
+    group_idx = np.fromiter(
+        (codes.setdefault(value, len(codes)) for value in attr_col[present]),
+        dtype=np.intp,
+        count=int(present.sum()),
+    )
+    return present, list(codes), group_idx
+
+
+def _profile_keys(columns: _ResultColumns) -> np.ndarray:
+    """Pack (income bracket, credit bracket) into one int64 key per row."""
+    import numpy as np
+
+    income_bracket = columns.income // 20000  # 20k brackets
+    credit_bracket = (columns.credit // 50).astype(np.int64)  # 50-point brackets
+    return (income_bracket << 32) | (credit_bracket & 0xFFFFFFFF)
+
+
+def _group_rates(group_idx, flags, n_groups: int):
+    """Fraction of ``flags`` set within each group."""
+    import numpy as np
+
+    totals = np.bincount(group_idx, minlength=n_groups)
+    hits = np.bincount(group_idx, weights=flags.astype(np.float64), minlength=n_groups)
+    return np.divide(hits, totals, out=np.zeros(n_groups), where=totals > 0)
+
+
+def _group_stats(columns: _ResultColumns, sensitive_attr: str):
+    """
+    Per-group rates shared by the three per-attribute fairness metrics.
+
+    Returns (group labels, approval rate per group, TPR per group). The
+    approval rate feeds both disparate impact and demographic parity; TPR
+    counts approvals among qualified applicants only, and is 0 for groups
+    with no qualified applicants.
+    """
+    present, groups, group_idx = _group_codes(columns, sensitive_attr)
+    n_groups = len(groups)
+    low = columns.low[present]
+    qualified = columns.qualified[present]
+    approval_rates = _group_rates(group_idx, low, n_groups)
+    tpr = _group_rates(group_idx[qualified], low[qualified], n_groups)
+    return groups, approval_rates, tpr
+
+
+def _group_stats_pandas(columns: _ResultColumns, attrs) -> Dict[str, tuple] | None:
+    """
+    pandas equivalent of _group_stats for every attr, sharing one DataFrame.
+
+    Results match _group_stats: groups in first-seen order, missing values
+    dropped, TPR 0 for groups without qualified applicants. Returns None when
+    pandas is not installed so callers fall back to the bincount path.
+    """
+    try:
+        import pandas as pd
+    except ImportError:
+        return None
+    import numpy as np
+
+    df = pd.DataFrame({"low": columns.low, "qualified": columns.qualified, **columns.attributes})
+    qualified_df = df[df["qualified"]]
+    stats = {}
+    for attr in attrs:
+        approval = df.groupby(attr, sort=False, observed=True)["low"].mean()
+        tpr = (
+            qualified_df.groupby(attr, sort=False, observed=True)["low"].mean()
+            .reindex(approval.index, fill_value=0.0)
+        )
+        stats[attr] = (
+            approval.index.tolist(),
+            approval.to_numpy(dtype=np.float64),
+            tpr.to_numpy(dtype=np.float64),
+        )
+    return stats
+
+
+def _calc_per_attr_batch(columns: _ResultColumns, attrs=SENSITIVE_ATTRIBUTES) -> Dict[str, Dict[str, Any]]:
+    """Compute disparate impact, equal opportunity and demographic parity for every attr."""
+    stats = _group_stats_pandas(columns, attrs) if columns.count >= PANDAS_MIN_RESULTS else None
+    if stats is None:
+        stats = {attr: _group_stats(columns, attr) for attr in attrs}
+
+    # Disparate impact ratios for all attrs at once
+    min_rates, max_rates, ratios = _disparate_impact_ratios([stats[attr][1] for attr in attrs])
+
+    metrics = {}
+    for i, attr in enumerate(attrs):
+        groups, approval_rates, tpr = stats[attr]
+        metrics[f"disparate_impact_{attr}"] = _disparate_impact_from_stats(
+            attr, groups, approval_rates, float(min_rates[i]), float(max_rates[i]), float(ratios[i])
+        )
+        metrics[f"equal_opportunity_{attr}"] = _equal_opportunity_from_stats(attr, groups, tpr)
+        metrics[f"demographic_parity_{attr}"] = _demographic_parity_from_stats(attr, groups, approval_rates)
+    return metrics
+
+
+def _disparate_impact_ratios(rates_by_attr: List[np.ndarray]):
+    """
+    Min rate, max rate and min/max ratio for each attr's approval rates.
+
+    Division is masked rather than branched: a zero max rate yields ratio 1.0.
+    Attrs with no groups get zeros (they are reported as insufficient anyway).
+    """
+    import numpy as np
+
+    min_rates = np.array([r.min() if len(r) else 0.0 for r in rates_by_attr], dtype=np.float64)
+    max_rates = np.array([r.max() if len(r) else 0.0 for r in rates_by_attr], dtype=np.float64)
+    ratios = np.divide(min_rates, max_rates, out=np.ones_like(min_rates), where=max_rates > 0)
+    return min_rates, max_rates, ratios
+
+
+def _grouped_variance(sorted_keys: np.ndarray, sorted_scores: np.ndarray, min_count: int):
+    """
+    Sample variance of each contiguous key run with at least ``min_count`` rows.
+
+    Returns (variances, number of distinct keys). Uses a two-pass reduction
+    (means, then squared deviations) to avoid cancellation on tight groups.
+    """
+    import numpy as np
+
+    _, starts, counts = np.unique(sorted_keys, return_index=True, return_counts=True)
+    if not len(counts):
+        return np.empty(0), 0
+    means = np.add.reduceat(sorted_scores, starts) / counts
+    sq_dev = (sorted_scores - np.repeat(means, counts)) ** 2
+    eligible = counts >= min_count
+    return np.add.reduceat(sq_dev, starts)[eligible] / (counts[eligible] - 1), len(counts)
+
+
+def _sampled_profile_order(profile_keys: np.ndarray, cap: int) -> np.ndarray:
+    """
+    Row indices sorted by profile key, keeping at most ``cap`` random rows per key.
+
+    Rows get a seeded random priority; sorting by (key, priority) and keeping
+    the first ``cap`` of each run samples every profile without replacement.
+    """
+    import numpy as np
+
+    n = len(profile_keys)
+    rng = np.random.default_rng(seed=0)
+    order = np.lexsort((rng.random(n), profile_keys))
+    sorted_keys = profile_keys[order]
+    starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+    rank = np.arange(n) - np.repeat(starts, np.diff(np.r_[starts, n]))
+    return order[rank < cap]
+
+
+def _grouped_variance_kernel(sorted_keys, sorted_scores, min_count, out):
+    """
+    Single-pass Welford equivalent of _grouped_variance, compiled with numba.
+
+    Writes eligible variances into the preallocated ``out`` and returns
+    (number written, number of distinct keys).
+    """
+    n = sorted_scores.shape[0]
+    n_out = 0
+    n_groups = 0
+    i = 0
+    while i < n:
+        key = sorted_keys[i]
+        count = 0
+        mean = 0.0
+        m2 = 0.0
+        while i < n and sorted_keys[i] == key:
+            count += 1
+            delta = sorted_scores[i] - mean
+            mean += delta / count
+            m2 += delta * (sorted_scores[i] - mean)
+            i += 1
+        n_groups += 1
+        if count >= min_count:
+            out[n_out] = m2 / (count - 1)
+            n_out += 1
+    return n_out, n_groups
+
+
+# One shared DataFrame + Cythonized groupby beats bincount-per-attr on big runs
+PANDAS_MIN_RESULTS = 100_000
+
+# Consistency samples at most PROFILE_SAMPLE_CAP rows per profile above this size
+SAMPLING_MIN_RESULTS = 50_000
+PROFILE_SAMPLE_CAP = 200
+
+# Compiled kernel only pays off once there are many small profile buckets
+NUMBA_MIN_RESULTS = 50_000
+_grouped_variance_jit = None  # compiled on first large run; False if numba is missing
+
+
+def _load_grouped_variance_jit():
+    """Compile the numba kernel once, or return None if numba is not installed."""
+    global _grouped_variance_jit
+    if _grouped_variance_jit is None:
+        try:
+            from numba import njit  # type: ignore
+        except ImportError:
+            _grouped_variance_jit = False
+        else:
+            _grouped_variance_jit = njit(cache=True)(_grouped_variance_kernel)
+    return _grouped_variance_jit or None
 
 
 def calculate_disparate_impact(results: List[Dict[str, Any]], sensitive_attr: str) -> Dict[str, Any]:
@@ -26,15 +394,21 @@ def calculate_disparate_impact(results: List[Dict[str, Any]], sensitive_attr: st
     Returns:
         Metric dict with score, level, explanation
     """
-    # Group results by sensitive attribute
-    groups = {}
-    for result in results:
-        attr_value = result["input"].get("applicant", {}).get(sensitive_attr)
-        if attr_value:
-            if attr_value not in groups:
-                groups[attr_value] = []
-            groups[attr_value].append(result)
-
+    groups, approval_rates, _ = _group_stats(_extract_columns(results, (sensitive_attr,)), sensitive_attr)
+    min_rates, max_rates, ratios = _disparate_impact_ratios([approval_rates])
+    return _disparate_impact_from_stats(
+        sensitive_attr, groups, approval_rates, float(min_rates[0]), float(max_rates[0]), float(ratios[0])
+    )
+
+
+def _disparate_impact_from_stats(
+    sensitive_attr: str,
+    groups: List[Any],
+    rates: np.ndarray,
+    min_rate: float,
+    max_rate: float,
+    ratio: float,
+) -> Dict[str, Any]:
     if len(groups) < 2:
         return {
             "metric_name": "disparate_impact",
@@ -44,38 +418,11 @@ def calculate_disparate_impact(results: List[Dict[str, Any]], sensitive_attr: st
             "details": {}
         }
 
-    # Calculate approval rates per group
-    approval_rates = {}
-    for group_name, group_results in groups.items():
-        approved = sum(1 for r in group_results if r["output"]["risk_level"] == "low")
-        approval_rates[group_name] = approved / len(group_results) if group_results else 0
-
-    # Find min and max rates
-    if not approval_rates:
-        return {
-            "metric_name": "disparate_impact",
-            "score": 1.0,
-            "level": "acceptable",
-            "explanation": "No approval data available",
-            "details": {}
-        }
-
-    min_rate = min(approval_rates.values())
-    max_rate = max(approval_rates.values())
-
-    # Disparate impact ratio
-    ratio = min_rate / max_rate if max_rate > 0 else 1.0
+    approval_rates = dict(zip(groups, rates.tolist()))
 
     # Determine level (80% rule)
-    if ratio >= 0.8:
-        level = "acceptable"
-        explanation = f"Disparate impact ratio {ratio:.2f} meets 80% rule"
-    elif ratio >= 0.6:
-        level = "warning"
-        explanation = f"Disparate impact ratio {ratio:.2f} below 80% threshold"
-    else:
-        level = "critical"
-        explanation = f"Disparate impact ratio {ratio:.2f} indicates significant disparity"
+    level, template = _DI_BANDS[bisect_right(_DI_THRESHOLDS, ratio)]
+    explanation = template.format(ratio=ratio)
 
     return {
         "metric_name": "disparate_impact",
@@ -97,23 +444,11 @@ def calculate_equal_opportunity(results: List[Dict[str, Any]], sensitive_attr: s
 
     Measures if qualified applicants get approved equally regardless of group.
     """
-    groups = {}
-    for result in results:
-        attr_value = result["input"].get("applicant", {}).get(sensitive_attr)
-        if attr_value:
-            if attr_value not in groups:
-                groups[attr_value] = {"qualified_approved": 0, "qualified_total": 0}
+    groups, _, tpr = _group_stats(_extract_columns(results, (sensitive_attr,)), sensitive_attr)
+    return _equal_opportunity_from_stats(sensitive_attr, groups, tpr)
 
-            # Consider "qualified" as having good credit + income
-            credit = result["input"].get("financial", {}).get("credit_score", 0)
-            income = result["input"].get("financial", {}).get("annual_income", 0)
-            qualified = credit >= 650 and income >= 40000
-
-            if qualified:
-                groups[attr_value]["qualified_total"] += 1
-                if result["output"]["risk_level"] == "low":
-                    groups[attr_value]["qualified_approved"] += 1
 
+def _equal_opportunity_from_stats(sensitive_attr: str, groups: List[Any], tpr: np.ndarray) -> Dict[str, Any]:
     if len(groups) < 2:
         return {
             "metric_name": "equal_opportunity",
@@ -123,39 +458,16 @@ def calculate_equal_opportunity(results: List[Dict[str, Any]], sensitive_attr: s
             "details": {}
         }
 
-    # Calculate TPR per group
-    tpr_by_group = {}
-    for group_name, group_data in groups.items():
-        if group_data["qualified_total"] > 0:
-            tpr_by_group[group_name] = group_data["qualified_approved"] / group_data["qualified_total"]
-        else:
-            tpr_by_group[group_name] = 0
-
-    if not tpr_by_group:
-        return {
-            "metric_name": "equal_opportunity",
-            "score": 1.0,
-            "level": "acceptable",
-            "explanation": "No qualified applicants in dataset",
-            "details": {}
-        }
+    tpr_by_group = dict(zip(groups, tpr.tolist()))
 
     # Measure max difference in TPR
-    tpr_values = list(tpr_by_group.values())
-    max_diff = max(tpr_values) - min(tpr_values)
+    max_diff = float(tpr.max() - tpr.min())
 
     # Score: 1 - max_diff (higher is better)
     score = 1 - max_diff
 
-    if max_diff <= 0.1:
-        level = "acceptable"
-        explanation = f"Equal opportunity difference {max_diff:.2f} is minimal"
-    elif max_diff <= 0.2:
-        level = "warning"
-        explanation = f"Equal opportunity difference {max_diff:.2f} shows disparity"
-    else:
-        level = "critical"
-        explanation = f"Equal opportunity difference {max_diff:.2f} indicates significant bias"
+    level, template = _EO_BANDS[bisect_left(_GAP_THRESHOLDS, max_diff)]
+    explanation = template.format(diff=max_diff)
 
     return {
         "metric_name": "equal_opportunity",
@@ -174,16 +486,11 @@ def calculate_demographic_parity(results: List[Dict[str, Any]], sensitive_attr:
     """
     Demographic Parity: positive outcome rates should be similar across groups.
     """
-    groups = {}
-    for result in results:
-        attr_value = result["input"].get("applicant", {}).get(sensitive_attr)
-        if attr_value:
-            if attr_value not in groups:
-                groups[attr_value] = {"total": 0, "positive": 0}
-            groups[attr_value]["total"] += 1
-            if result["output"]["risk_level"] == "low":
-                groups[attr_value]["positive"] += 1
+    groups, positive_rates, _ = _group_stats(_extract_columns(results, (sensitive_attr,)), sensitive_attr)
+    return _demographic_parity_from_stats(sensitive_attr, groups, positive_rates)
 
+
+def _demographic_parity_from_stats(sensitive_attr: str, groups: List[Any], rates: np.ndarray) -> Dict[str, Any]:
     if len(groups) < 2:
         return {
             "metric_name": "demographic_parity_gap",
@@ -193,27 +500,13 @@ def calculate_demographic_parity(results: List[Dict[str, Any]], sensitive_attr:
             "details": {}
         }
 
-    # Calculate positive rates
-    positive_rates = {}
-    for group_name, group_data in groups.items():
-        if group_data["total"] > 0:
-            positive_rates[group_name] = group_data["positive"] / group_data["total"]
-        else:
-            positive_rates[group_name] = 0
+    positive_rates = dict(zip(groups, rates.tolist()))
 
     # Max difference (gap)
-    rates = list(positive_rates.values())
-    gap = max(rates) - min(rates)
-
-    if gap <= 0.1:
-        level = "acceptable"
-        explanation = f"Demographic parity gap {gap:.2f} is acceptable"
-    elif gap <= 0.2:
-        level = "warning"
-        explanation = f"Demographic parity gap {gap:.2f} shows imbalance"
-    else:
-        level = "critical"
-        explanation = f"Demographic parity gap {gap:.2f} indicates significant disparity"
+    gap = float(rates.max() - rates.min())
+
+    level, template = _DP_BANDS[bisect_left(_GAP_THRESHOLDS, gap)]
+    explanation = template.format(gap=gap)
 
     return {
         "metric_name": "demographic_parity_gap",
@@ -234,29 +527,35 @@ def calculate_consistency_score(results: List[Dict[str, Any]]) -> Dict[str, Any]
 
     Measures variance in risk scores for applicants with similar profiles.
     """
+    return _consistency_from_cols(_extract_columns(results, ()))
+
+
+def _consistency_from_cols(columns: _ResultColumns) -> Dict[str, Any]:
+    import numpy as np
+
     # Group by similar profiles (income bracket + credit bracket)
-    def get_profile_key(result):
-        income = result["input"].get("financial", {}).get("annual_income", 0)
-        credit = result["input"].get("financial", {}).get("credit_score", 0)
-        income_bracket = income // 20000  # 20k brackets
-        credit_bracket = credit // 50  # 50-point brackets
-        return f"{income_bracket}_{credit_bracket}"
-
-    profiles = {}
-    for result in results:
-        key = get_profile_key(result)
-        if key not in profiles:
-            profiles[key] = []
-        profiles[key].append(result["output"]["risk_score"])
-
-    # Calculate variance within each profile
-    variances = []
-    for profile_key, scores in profiles.items():
-        if len(scores) >= 3:  # Need at least 3 for meaningful variance
-            variance = statistics.variance(scores) if len(scores) > 1 else 0
-            variances.append(variance)
-
-    if not variances:
+    profile_keys = _profile_keys(columns)
+
+    # Sort by profile so each profile is a contiguous run of scores.
+    # Very large runs keep a seeded random sample per profile instead, since
+    # within-profile variance converges long before every row is seen.
+    # Need at least 3 scores for meaningful variance.
+    sampled = columns.count > SAMPLING_MIN_RESULTS
+    if sampled:
+        order = _sampled_profile_order(profile_keys, PROFILE_SAMPLE_CAP)
+    else:
+        order = np.argsort(profile_keys, kind="stable")
+    sorted_keys = profile_keys[order]
+    sorted_scores = columns.risk_score[order]
+    kernel = _load_grouped_variance_jit() if columns.count > NUMBA_MIN_RESULTS else None
+    if kernel is not None:
+        variances = np.empty(len(order), dtype=np.float64)
+        n_variances, profile_count = kernel(sorted_keys, sorted_scores, 3, variances)
+        variances = variances[:n_variances]
+    else:
+        variances, profile_count = _grouped_variance(sorted_keys, sorted_scores, 3)
+
+    if not len(variances):
         return {
             "metric_name": "consistency_score",
             "score": 1.0,
@@ -265,37 +564,27 @@ def calculate_consistency_score(results: List[Dict[str, Any]]) -> Dict[str, Any]
             "details": {}
         }
 
-    avg_variance = statistics.mean(variances)
+    avg_variance = float(variances.mean())
 
     # Normalize: lower variance = higher consistency
     # Typical risk score variance of 100-400 is concerning
-    if avg_variance <= 50:
-        score = 1.0
-        level = "acceptable"
-        explanation = f"Model is highly consistent (variance {avg_variance:.1f})"
-    elif avg_variance <= 150:
-        score = 0.7
-        level = "acceptable"
-        explanation = f"Model shows acceptable consistency (variance {avg_variance:.1f})"
-    elif avg_variance <= 300:
-        score = 0.5
-        level = "warning"
-        explanation = f"Model consistency is moderate (variance {avg_variance:.1f})"
-    else:
-        score = 0.3
-        level = "critical"
-        explanation = f"Model shows high inconsistency (variance {avg_variance:.1f})"
+    score, level, template = _CONSISTENCY_BANDS[bisect_left(_CONSISTENCY_THRESHOLDS, avg_variance)]
+    explanation = template.format(variance=avg_variance)
+
+    details = {
+        "avg_variance": avg_variance,
+        "profile_count": profile_count,
+        "analyzed_profiles": len(variances),
+    }
+    if sampled:
+        details["sampled_per_profile"] = PROFILE_SAMPLE_CAP
 
     return {
         "metric_name": "consistency_score",
         "score": score,
         "level": level,
         "explanation": explanation,
-        "details": {
-            "avg_variance": avg_variance,
-            "profile_count": len(profiles),
-            "analyzed_profiles": len(variances),
-        }
+        "details": details,
     }
 
 
@@ -305,7 +594,13 @@ def calculate_stability_score(results_original: List[Dict[str, Any]], results_no
 
     Compares original results to results with minor noise added.
     """
-    if len(results_original) != len(results_noisy):
+    return _stability_from_cols(_extract_outcomes(results_original), _extract_outcomes(results_noisy))
+
+
+def _stability_from_cols(original: _OutcomeColumns, noisy: _OutcomeColumns) -> Dict[str, Any]:
+    import numpy as np
+
+    if original.count != noisy.count:
         return {
             "metric_name": "stability_score",
             "score": 1.0,
@@ -315,37 +610,20 @@ def calculate_stability_score(results_original: List[Dict[str, Any]], results_no
         }
 
     # Measure score differences
-    score_diffs = []
-    level_changes = 0
-
-    for orig, noisy in zip(results_original, results_noisy):
-        orig_score = orig["output"]["risk_score"]
-        noisy_score = noisy["output"]["risk_score"]
-        score_diffs.append(abs(orig_score - noisy_score))
-
-        if orig["output"]["risk_level"] != noisy["output"]["risk_level"]:
-            level_changes += 1
-
-    avg_diff = statistics.mean(score_diffs)
-    level_change_rate = level_changes / len(results_original)
-
-    # Score based on average difference and level changes
-    if avg_diff <= 5 and level_change_rate <= 0.05:
-        score = 1.0
-        level = "acceptable"
-        explanation = f"Model is highly stable (avg diff {avg_diff:.1f}, {level_change_rate:.1%} level changes)"
-    elif avg_diff <= 10 and level_change_rate <= 0.15:
-        score = 0.8
-        level = "acceptable"
-        explanation = f"Model shows good stability (avg diff {avg_diff:.1f}, {level_change_rate:.1%} level changes)"
-    elif avg_diff <= 20 and level_change_rate <= 0.30:
-        score = 0.6
-        level = "warning"
-        explanation = f"Model stability is moderate (avg diff {avg_diff:.1f}, {level_change_rate:.1%} level changes)"
-    else:
-        score = 0.4
-        level = "critical"
-        explanation = f"Model is unstable (avg diff {avg_diff:.1f}, {level_change_rate:.1%} level changes)"
+    score_diffs = np.abs(original.risk_score - noisy.risk_score)
+    level_changes = int((original.risk_level != noisy.risk_level).sum())
+
+    avg_diff = float(score_diffs.mean())
+    level_change_rate = level_changes / original.count
+
+    # Score based on average difference and level changes: the worse of the
+    # two bands wins
+    band = max(
+        bisect_left(_STABILITY_DIFF_THRESHOLDS, avg_diff),
+        bisect_left(_STABILITY_CHANGE_THRESHOLDS, level_change_rate),
+    )
+    score, level, template = _STABILITY_BANDS[band]
+    explanation = template.format(diff=avg_diff, rate=level_change_rate)
 
     return {
         "metric_name": "stability_score",
@@ -356,7 +634,7 @@ def calculate_stability_score(results_original: List[Dict[str, Any]], results_no
             "avg_score_difference": avg_diff,
             "level_change_rate": level_change_rate,
             "level_changes": level_changes,
-            "total_comparisons": len(results_original),
+            "total_comparisons": original.count,
         }
     }
 
@@ -365,39 +643,26 @@ def calculate_rule_violation_severity(results: List[Dict[str, Any]]) -> Dict[str
     """
     Measure severity of ethical rule violations across all results.
     """
-    total = len(results)
-    violation_counts = {}
-    high_risk_count = 0
+    return _rule_violation_from_cols(_extract_columns(results, ()))
 
-    for result in results:
-        triggered = result["output"].get("triggered_rules", [])
-        for rule in triggered:
-            violation_counts[rule] = violation_counts.get(rule, 0) + 1
 
-        if result["output"]["risk_level"] == "high":
-            high_risk_count += 1
+def _rule_violation_from_cols(columns: _ResultColumns) -> Dict[str, Any]:
+    total = columns.count
+    violation_counts = dict(Counter(chain.from_iterable(columns.triggered_rules)))
+    high_risk_count = int((columns.risk_level == "high").sum())
 
     total_violations = sum(violation_counts.values())
     violation_rate = total_violations / total if total > 0 else 0
     high_risk_rate = high_risk_count / total if total > 0 else 0
 
-    # Severity based on violation rate and high-risk rate
-    if violation_rate <= 0.1 and high_risk_rate <= 0.05:
-        score = 1.0
-        level = "acceptable"
-        explanation = f"Low violation rate ({violation_rate:.1%}), high-risk rate ({high_risk_rate:.1%})"
-    elif violation_rate <= 0.25 and high_risk_rate <= 0.15:
-        score = 0.7
-        level = "acceptable"
-        explanation = f"Acceptable violation rate ({violation_rate:.1%}), high-risk rate ({high_risk_rate:.1%})"
-    elif violation_rate <= 0.40 and high_risk_rate <= 0.30:
-        score = 0.5
-        level = "warning"
-        explanation = f"Moderate violation rate ({violation_rate:.1%}), high-risk rate ({high_risk_rate:.1%})"
-    else:
-        score = 0.3
-        level = "critical"
-        explanation = f"High violation rate ({violation_rate:.1%}), high-risk rate ({high_risk_rate:.1%})"
+    # Severity based on violation rate and high-risk rate: the worse of the
+    # two bands wins
+    band = max(
+        bisect_left(_VIOLATION_RATE_THRESHOLDS, violation_rate),
+        bisect_left(_HIGH_RISK_RATE_THRESHOLDS, high_risk_rate),
+    )
+    score, level, template = _VIOLATION_BANDS[band]
+    explanation = template.format(violation_rate=violation_rate, high_risk_rate=high_risk_rate)
 
     return {
         "metric_name": "rule_violation_severity",
@@ -426,29 +691,28 @@ def calculate_all_metrics(results: List[Dict[str, Any]], results_noisy: List[Dic
     Returns:
         Dictionary of all metrics with overall fairness score
     """
-    metrics = {}
+    # Extract every column once and share it across all metrics
+    columns = _extract_columns(results)
 
     # Fairness metrics by sensitive attribute
-    for attr in ["gender", "ethnicity"]:
-        metrics[f"disparate_impact_{attr}"] = calculate_disparate_impact(results, attr)
-        metrics[f"equal_opportunity_{attr}"] = calculate_equal_opportunity(results, attr)
-        metrics[f"demographic_parity_{attr}"] = calculate_demographic_parity(results, attr)
+    metrics = _calc_per_attr_batch(columns)
 
     # Model quality metrics
-    metrics["consistency"] = calculate_consistency_score(results)
-    metrics["rule_violations"] = calculate_rule_violation_severity(results)
+    metrics["consistency"] = _consistency_from_cols(columns)
+    metrics["rule_violations"] = _rule_violation_from_cols(columns)
 
     # Stability (if noisy data provided)
     if results_noisy:
-        metrics["stability"] = calculate_stability_score(results, results_noisy)
+        metrics["stability"] = _stability_from_cols(columns, _extract_outcomes(results_noisy))
 
     # Calculate overall fairness score (average of all metric scores)
     all_scores = [m["score"] for m in metrics.values()]
-    overall_score = statistics.mean(all_scores) if all_scores else 0.0
+    overall_score = sum(all_scores) / len(all_scores) if all_scores else 0.0
 
     # Determine overall level
-    critical_count = sum(1 for m in metrics.values() if m["level"] == "critical")
-    warning_count = sum(1 for m in metrics.values() if m["level"] == "warning")
+    level_counts = Counter(m["level"] for m in metrics.values())
+    critical_count = level_counts["critical"]
+    warning_count = level_counts["warning"]
 
     if critical_count > 0:
         overall_level = "critical"
@@ -7,6 +7,170 @@ from typing import Dict, Any, List
 from datetime import datetime
 import json
 
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    # Optional fast serializer; export falls back to stdlib json without it
+    orjson = None  # type: ignore
+
+from jinja2 import BaseLoader, Environment
+
+
+_EXPORT_BUFFER_SIZE = 1 << 20
+
+_DEFAULT_COLOR = "#6b7280"
+_STATUS_COLORS = {
+    "pass": "#10b981",
+    "conditional_pass": "#f59e0b",
+    "fail": "#ef4444",
+}
+_LEVEL_COLORS = {
+    "acceptable": "#10b981",
+    "warning": "#f59e0b",
+    "critical": "#ef4444",
+}
+
+# Recommendation text by metric level and name
+_REC_TEMPLATES = {
+    "critical": {
+        "disparate_impact": (
+            "CRITICAL: Disparate impact score {score:.2f} fails 80% rule. "
+            "Review model features for protected attribute bias. Consider retraining with fairness constraints."
+        ),
+        "equal_opportunity": (
+            "CRITICAL: Equal opportunity score {score:.2f} shows significant TPR differences. "
+            "Investigate model performance across demographic groups. Ensure training data is balanced."
+        ),
+        "demographic_parity": (
+            "CRITICAL: Demographic parity score {score:.2f} shows unequal positive outcome rates. "
+            "Review decision thresholds and calibration across groups."
+        ),
+        "consistency": (
+            "CRITICAL: Consistency score {score:.2f} shows high variance for similar profiles. "
+            "Model may be unstable. Review feature importance and model complexity."
+        ),
+        "stability": (
+            "CRITICAL: Stability score {score:.2f} shows sensitivity to input noise. "
+            "Model lacks robustness. Consider regularization or ensemble methods."
+        ),
+        "rule_violations": (
+            "CRITICAL: Rule violation severity {score:.2f} indicates ethical policy breaches. "
+            "Review triggered rules and implement safeguards."
+        ),
+    },
+    "warning": {
+        "disparate_impact": "WARNING: Disparate impact score {score:.2f} approaches critical threshold. Monitor closely.",
+        "equal_opportunity": "WARNING: Equal opportunity score {score:.2f} shows moderate TPR differences. Review group performance.",
+        "demographic_parity": "WARNING: Demographic parity score {score:.2f} shows outcome rate gaps. Consider threshold adjustments.",
+        "consistency": "WARNING: Consistency score {score:.2f} shows some variance. Review feature correlations.",
+        "stability": "WARNING: Stability score {score:.2f} shows some sensitivity to noise. Consider model robustness improvements.",
+    },
+}
+
+# Flattened to one lookup per metric, with the bound str.format resolved at import
+_REC_FORMATTERS = {
+    (level, name): template.format
+    for level, templates in _REC_TEMPLATES.items()
+    for name, template in templates.items()
+}
+
+_HTML_SOURCE = """
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <meta charset="UTF-8">
+        <title>Model Validation Report - {{ report.report_id }}</title>
+        <style>
+            body { font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; margin: 40px; background: #f9fafb; }
+            .container { max-width: 1200px; margin: 0 auto; background: white; padding: 40px; border-radius: 8px; box-shadow: 0 1px 3px rgba(0,0,0,0.1); }
+            h1 { color: #111827; margin-bottom: 8px; }
+            .subtitle { color: #6b7280; margin-bottom: 32px; }
+            .section { margin-bottom: 32px; }
+            .section h2 { color: #374151; border-bottom: 2px solid #e5e7eb; padding-bottom: 8px; }
+            table { width: 100%; border-collapse: collapse; margin-top: 16px; }
+            th { text-align: left; padding: 12px; background: #f3f4f6; border-bottom: 2px solid #e5e7eb; color: #374151; }
+            .status-badge { display: inline-block; padding: 8px 16px; border-radius: 6px; color: white; background: {{ status_color }}; font-weight: 600; }
+            .metric-card { background: #f9fafb; padding: 16px; border-radius: 6px; margin-bottom: 16px; }
+        </style>
+    </head>
+    <body>
+        <div class="container">
+            <h1>🛡️ Model Validation Report</h1>
+            <div class="subtitle">
+                Report ID: {{ report.report_id }}<br>
+                Generated: {{ report.timestamp }}<br>
+                Model: {{ report.model_metadata.get('name', 'Unknown') }} v{{ report.model_metadata.get('version', '1.0') }}
+            </div>
+
+            <div class="section">
+                <h2>Overall Status</h2>
+                <div style="margin-top: 16px;">
+                    <span class="status-badge">{{ report.status.upper().replace('_', ' ') }}</span>
+                    <p style="margin-top: 16px; color: #4b5563;">{{ report.status_reason }}</p>
+                    <div style="margin-top: 16px; background: #f3f4f6; padding: 16px; border-radius: 6px;">
+                        <strong>Overall Fairness Score:</strong> {{ '%.1f' % report.fairness_metrics.overall_score }}/100<br>
+                        <strong>Confidence Score:</strong> {{ '%.1f' % report.confidence_score }}/100
+                    </div>
+                </div>
+            </div>
+
+            <div class="section">
+                <h2>Test Dataset</h2>
+                <p>
+                    <strong>Total Cases:</strong> {{ report.synthetic_dataset.total_cases }}<br>
+                    <strong>Edge Cases:</strong> {{ report.synthetic_dataset.edge_cases }}<br>
+                    <strong>Successful Evaluations:</strong> {{ report.validation_summary.get('successful_evaluations', 0) }}<br>
+                    <strong>Average Risk Score:</strong> {{ '%.1f' % report.validation_summary.get('avg_risk_score', 0) }}
+                </p>
+            </div>
+
+            <div class="section">
+                <h2>Fairness Metrics</h2>
+                <table>
+                    <thead>
+                        <tr>
+                            <th>Metric</th>
+                            <th>Score</th>
+                            <th>Level</th>
+                            <th>Explanation</th>
+                        </tr>
+                    </thead>
+                    <tbody>
+                        {% for metric in report.fairness_metrics.metrics %}
+        <tr>
+            <td style="padding: 12px; border-bottom: 1px solid #e5e7eb;">{{ metric.metric }}</td>
+            <td style="padding: 12px; border-bottom: 1px solid #e5e7eb;">{{ '%.2f' % metric.score }}</td>
+            <td style="padding: 12px; border-bottom: 1px solid #e5e7eb;">
+                <span style="background: {{ level_colors.get(metric.level, default_color) }}; color: white; padding: 4px 8px; border-radius: 4px; font-size: 12px;">
+                    {{ metric.level.upper() }}
+                </span>
+            </td>
+            <td style="padding: 12px; border-bottom: 1px solid #e5e7eb;">{{ metric.explanation }}</td>
+        </tr>
+                        {% endfor %}
+                    </tbody>
+                </table>
+            </div>
+
+            <div class="section">
+                <h2>Recommendations</h2>
+                <ul style="list-style: none; padding: 0;">
+                    {% for rec in report.recommendations %}
+        {% set rec_color = '#ef4444' if 'CRITICAL' in rec else '#f59e0b' if 'WARNING' in rec else '#10b981' %}
+        <li style="margin-bottom: 8px; padding: 8px; border-left: 3px solid {{ rec_color }}; background: #f9fafb;">
+            {{ rec }}
+        </li>
+                    {% endfor %}
+                </ul>
+            </div>
+        </div>
+    </body>
+    </html>
+"""
+
+# Compiled once per process; renders reuse the generated Python code
+_HTML_TEMPLATE = Environment(loader=BaseLoader(), autoescape=True).from_string(_HTML_SOURCE)
+
 
 def generate_validation_report(
     model_metadata: Dict[str, Any],
@@ -28,7 +192,9 @@ def generate_validation_report(
     Returns:
         Dict with report_json, report_html (optional), pass_fail, recommendations
     """
-    timestamp = datetime.utcnow().isoformat() + "Z"
+    # One clock read so timestamp and report_id always agree
+    now = datetime.utcnow()
+    timestamp = now.isoformat() + "Z"
 
     # Determine overall pass/fail
     overall_score = metrics.get("overall_fairness_score", 0)
@@ -52,7 +218,7 @@ def generate_validation_report(
 
     # Build JSON report
     report_json = {
-        "report_id": f"val-{datetime.utcnow().strftime('%Y%m%d-%H%M%S')}",
+        "report_id": f"val-{now:%Y%m%d-%H%M%S}",
         "timestamp": timestamp,
         "model_metadata": model_metadata,
         "synthetic_dataset": {
@@ -95,63 +261,9 @@ def _generate_recommendations(metrics: Dict[str, Any], validation_summary: Dict[
     recommendations = []
 
     for metric in metrics.get("metrics", []):
-        metric_name = metric.get("metric")
-        level = metric.get("level")
-        score = metric.get("score", 0)
-
-        if level == "critical":
-            if metric_name == "disparate_impact":
-                recommendations.append(
-                    f"CRITICAL: Disparate impact score {score:.2f} fails 80% rule. "
-                    "Review model features for protected attribute bias. Consider retraining with fairness constraints."
-                )
-            elif metric_name == "equal_opportunity":
-                recommendations.append(
-                    f"CRITICAL: Equal opportunity score {score:.2f} shows significant TPR differences. "
-                    "Investigate model performance across demographic groups. Ensure training data is balanced."
-                )
-            elif metric_name == "demographic_parity":
-                recommendations.append(
-                    f"CRITICAL: Demographic parity score {score:.2f} shows unequal positive outcome rates. "
-                    "Review decision thresholds and calibration across groups."
-                )
-            elif metric_name == "consistency":
-                recommendations.append(
-                    f"CRITICAL: Consistency score {score:.2f} shows high variance for similar profiles. "
-                    "Model may be unstable. Review feature importance and model complexity."
-                )
-            elif metric_name == "stability":
-                recommendations.append(
-                    f"CRITICAL: Stability score {score:.2f} shows sensitivity to input noise. "
-                    "Model lacks robustness. Consider regularization or ensemble methods."
-                )
-            elif metric_name == "rule_violations":
-                recommendations.append(
-                    f"CRITICAL: Rule violation severity {score:.2f} indicates ethical policy breaches. "
-                    "Review triggered rules and implement safeguards."
-                )
-
-        elif level == "warning":
-            if metric_name == "disparate_impact":
-                recommendations.append(
-                    f"WARNING: Disparate impact score {score:.2f} approaches critical threshold. Monitor closely."
-                )
-            elif metric_name == "equal_opportunity":
-                recommendations.append(
-                    f"WARNING: Equal opportunity score {score:.2f} shows moderate TPR differences. Review group performance."
-                )
-            elif metric_name == "demographic_parity":
-                recommendations.append(
-                    f"WARNING: Demographic parity score {score:.2f} shows outcome rate gaps. Consider threshold adjustments."
-                )
-            elif metric_name == "consistency":
-                recommendations.append(
-                    f"WARNING: Consistency score {score:.2f} shows some variance. Review feature correlations."
-                )
-            elif metric_name == "stability":
-                recommendations.append(
-                    f"WARNING: Stability score {score:.2f} shows some sensitivity to noise. Consider model robustness improvements."
-                )
+        formatter = _REC_FORMATTERS.get((metric.get("level"), metric.get("metric")))
+        if formatter is not None:
+            recommendations.append(formatter(score=metric.get("score", 0)))
 
     # General recommendations
     avg_risk = validation_summary.get("avg_risk_score", 50)
@@ -207,138 +319,57 @@ def _generate_html_report(report_json: Dict[str, Any]) -> str:
     """
     Generate HTML version of validation report.
     """
-    status = report_json["status"]
-    status_color = {
-        "pass": "#10b981",
-        "conditional_pass": "#f59e0b",
-        "fail": "#ef4444",
-    }.get(status, "#6b7280")
-
-    metrics_html = ""
-    for metric in report_json["fairness_metrics"]["metrics"]:
-        level_color = {
-            "acceptable": "#10b981",
-            "warning": "#f59e0b",
-            "critical": "#ef4444",
-        }.get(metric["level"], "#6b7280")
-
-        metrics_html += f"""
-        <tr>
-            <td style="padding: 12px; border-bottom: 1px solid #e5e7eb;">{metric['metric']}</td>
-            <td style="padding: 12px; border-bottom: 1px solid #e5e7eb;">{metric['score']:.2f}</td>
-            <td style="padding: 12px; border-bottom: 1px solid #e5e7eb;">
-                <span style="background: {level_color}; color: white; padding: 4px 8px; border-radius: 4px; font-size: 12px;">
-                    {metric['level'].upper()}
-                </span>
-            </td>
-            <td style="padding: 12px; border-bottom: 1px solid #e5e7eb;">{metric['explanation']}</td>
-        </tr>
-        """
-
-    recommendations_html = ""
-    for rec in report_json["recommendations"]:
-        rec_color = "#ef4444" if "CRITICAL" in rec else "#f59e0b" if "WARNING" in rec else "#10b981"
-        recommendations_html += f"""
-        <li style="margin-bottom: 8px; padding: 8px; border-left: 3px solid {rec_color}; background: #f9fafb;">
-            {rec}
-        </li>
-        """
-
-    html = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <meta charset="UTF-8">
-        <title>Model Validation Report - {report_json['report_id']}</title>
-        <style>
-            body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; margin: 40px; background: #f9fafb; }}
-            .container {{ max-width: 1200px; margin: 0 auto; background: white; padding: 40px; border-radius: 8px; box-shadow: 0 1px 3px rgba(0,0,0,0.1); }}
-            h1 {{ color: #111827; margin-bottom: 8px; }}
-            .subtitle {{ color: #6b7280; margin-bottom: 32px; }}
-            .section {{ margin-bottom: 32px; }}
-            .section h2 {{ color: #374151; border-bottom: 2px solid #e5e7eb; padding-bottom: 8px; }}
-            table {{ width: 100%; border-collapse: collapse; margin-top: 16px; }}
-            th {{ text-align: left; padding: 12px; background: #f3f4f6; border-bottom: 2px solid #e5e7eb; color: #374151; }}
-            .status-badge {{ display: inline-block; padding: 8px 16px; border-radius: 6px; color: white; background: {status_color}; font-weight: 600; }}
-            .metric-card {{ background: #f9fafb; padding: 16px; border-radius: 6px; margin-bottom: 16px; }}
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <h1>🛡️ Model Validation Report</h1>
-            <div class="subtitle">
-                Report ID: {report_json['report_id']}<br>
-                Generated: {report_json['timestamp']}<br>
-                Model: {report_json['model_metadata'].get('name', 'Unknown')} v{report_json['model_metadata'].get('version', '1.0')}
-            </div>
+    return _HTML_TEMPLATE.render(
+        report=report_json,
+        status_color=_STATUS_COLORS.get(report_json["status"], _DEFAULT_COLOR),
+        level_colors=_LEVEL_COLORS,
+        default_color=_DEFAULT_COLOR,
+    )
 
-            <div class="section">
-                <h2>Overall Status</h2>
-                <div style="margin-top: 16px;">
-                    <span class="status-badge">{status.upper().replace('_', ' ')}</span>
-                    <p style="margin-top: 16px; color: #4b5563;">{report_json['status_reason']}</p>
-                    <div style="margin-top: 16px; background: #f3f4f6; padding: 16px; border-radius: 6px;">
-                        <strong>Overall Fairness Score:</strong> {report_json['fairness_metrics']['overall_score']:.1f}/100<br>
-                        <strong>Confidence Score:</strong> {report_json['confidence_score']:.1f}/100
-                    </div>
-                </div>
-            </div>
 
-            <div class="section">
-                <h2>Test Dataset</h2>
-                <p>
-                    <strong>Total Cases:</strong> {report_json['synthetic_dataset']['total_cases']}<br>
-                    <strong>Edge Cases:</strong> {report_json['synthetic_dataset']['edge_cases']}<br>
-                    <strong>Successful Evaluations:</strong> {report_json['validation_summary'].get('successful_evaluations', 0)}<br>
-                    <strong>Average Risk Score:</strong> {report_json['validation_summary'].get('avg_risk_score', 0):.1f}
-                </p>
-            </div>
-
-            <div class="section">
-                <h2>Fairness Metrics</h2>
-                <table>
-                    <thead>
-                        <tr>
-                            <th>Metric</th>
-                            <th>Score</th>
-                            <th>Level</th>
-                            <th>Explanation</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-                        {metrics_html}
-                    </tbody>
-                </table>
-            </div>
-
-            <div class="section">
-                <h2>Recommendations</h2>
-                <ul style="list-style: none; padding: 0;">
-                    {recommendations_html}
-                </ul>
-            </div>
-        </div>
-    </body>
-    </html>
+def _flatten_for_export(report_json: Dict[str, Any]) -> Dict[str, Any]:
     """
+    Hoist fairness_metrics.metrics to a top-level "metrics" key for export.
 
-    return html
+    Keeps the exported document shallow; fairness_metrics retains only overall_score.
+    """
+    flat: Dict[str, Any] = {}
+    for key, value in report_json.items():
+        if key == "fairness_metrics":
+            flat[key] = {"overall_score": value.get("overall_score", 0)}
+            flat["metrics"] = value.get("metrics", [])
+        else:
+            flat[key] = value
+    return flat
 
 
 def export_report_json(report: Dict[str, Any], filepath: str) -> None:
     """
     Export report to JSON file.
+
+    Metrics are written as a top-level "metrics" list (see _flatten_for_export).
     """
-    with open(filepath, 'w') as f:
-        json.dump(report["report_json"], f, indent=2)
+    data = _flatten_for_export(report["report_json"])
+    if orjson is not None:
+        with open(filepath, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+        return
+
+    # json.dump streams many small chunks; a large buffer batches them into few writes
+    with open(filepath, 'w', buffering=_EXPORT_BUFFER_SIZE) as f:
+        json.dump(data, f, indent=2)
 
 
 def export_report_html(report: Dict[str, Any], filepath: str) -> None:
     """
     Export report to HTML file.
+
+    Uses report["report_html"] when present, otherwise renders it from report_json
+    on demand so callers need not regenerate the report with include_html=True.
     """
-    if "report_html" not in report:
-        raise ValueError("HTML report not generated. Set include_html=True when generating report.")
+    html = report.get("report_html")
+    if html is None:
+        html = _generate_html_report(report["report_json"])
 
     with open(filepath, 'w') as f:
-        f.write(report["report_html"])
+        f.write(html)
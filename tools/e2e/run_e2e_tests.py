@@ -7,13 +7,64 @@ Tests complete user workflows from registration to report export
 import asyncio
 import aiohttp
 import json
-import random
 import time
 from typing import Dict, Any, Optional
 
+import numpy as np
+
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    # Optional fast serializer; stdlib json is used without it
+    orjson = None  # type: ignore
+
+try:
+    import uvloop  # type: ignore
+except Exception:  # pragma: no cover
+    # Optional libuv event loop; the default asyncio loop is used without it
+    uvloop = None  # type: ignore
+
+
+# Category values for the generated dataset; columns carry their indexes
+AGE_BUCKETS = ('18-25', '26-35', '36-45', '46-55', '56+')
+GENDERS = ('male', 'female')
+ETHNICITIES = ('group_a', 'group_b', 'group_c')
+
+# Failure bodies (JSON or text) are triaged with byte-substring checks on the
+# raw body: bytes containment runs in C over the buffer, with no JSON parse
+# or str copy. Structural checks on success bodies parse once with _loads
+# instead, since a substring can match anywhere in the document.
+
+# Any of these top-level keys in an /analyze response marks a well-formed result
+ANALYSIS_KEYS = ("bias_metrics", "shap_values", "fairness_score", "analysis_id")
+# Lower-cased markers of a fairness-related 400/500 from /analyze
+FAIRNESS_FAILURE_MARKERS = (b"fairness", b"violation", b"analysis failed")
+
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize a request body to JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
+
+def _loads(body: bytes) -> Any:
+    """Parse a JSON body from bytes."""
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+async def _read_json(resp: aiohttp.ClientResponse) -> Any:
+    """Parse a response body straight from its bytes."""
+    return _loads(await resp.read())
+
+
 class E2ETestSuite:
-    def __init__(self, base_url: str = "http://localhost:5000"):
+    def __init__(self, base_url: str = "http://localhost:5000", seed: Optional[int] = None):
         self.base_url = base_url
+        # One generator per suite; pass a seed for a reproducible dataset
+        self.rng = np.random.default_rng(seed)
         self.session: Optional[aiohttp.ClientSession] = None
         self.auth_token: Optional[str] = None
         self.user_id: Optional[str] = None
@@ -21,6 +72,8 @@ class E2ETestSuite:
             "email": f"test_user_{int(time.time())}@ethixai.test",
             "password": "TestPass123!@#"
         }
+        # Generated once per suite; repeated run_all_tests calls reuse it
+        self.dataset = self._generate_test_dataset(100)
         self.test_results = {
             "passed": 0,
             "failed": 0,
@@ -29,7 +82,11 @@ class E2ETestSuite:
 
     async def setup(self):
         """Initialize test session"""
-        self.session = aiohttp.ClientSession()
+        # Enough pooled connections for the concurrently running tests, kept
+        # alive across stages (the /analyze call alone may take up to 30s).
+        # aiohttp already sets TCP_NODELAY on every connection it opens.
+        connector = aiohttp.TCPConnector(limit=16, keepalive_timeout=75)
+        self.session = aiohttp.ClientSession(connector=connector)
         print(f"[Setup] Test session initialized")
         print(f"[Setup] Test user: {self.test_user['email']}")
 
@@ -39,6 +96,12 @@ class E2ETestSuite:
             await self.session.close()
         print(f"\n[Teardown] Test session closed")
 
+    def _post_json(self, url: str, payload: Any, headers: Optional[Dict[str, str]] = None, **kwargs):
+        """POST a JSON body serialized by _dumps; use as `async with`."""
+        assert self.session is not None, "Session not initialized"
+        headers = {**(headers or {}), "Content-Type": "application/json"}
+        return self.session.post(url, data=_dumps(payload), headers=headers, **kwargs)
+
     async def assert_test(self, name: str, condition: bool, message: str = ""):
         """Assert test condition"""
         if condition:
@@ -61,7 +124,7 @@ class E2ETestSuite:
                     resp.status == 200,
                     f"Expected 200, got {resp.status}"
                 )
-                data = await resp.json()
+                data = await _read_json(resp)
                 await self.assert_test(
                     "Health check response",
                     data.get("status") in ("healthy", "backend ok"),
@@ -76,9 +139,9 @@ class E2ETestSuite:
         try:
             assert self.session is not None, "Session not initialized"
             reg_payload = { **self.test_user, "name": "Test User" }
-            async with self.session.post(
+            async with self._post_json(
                 f"{self.base_url}/auth/register",
-                json=reg_payload
+                reg_payload
             ) as resp:
                 await self.assert_test(
                     "Registration status",
@@ -87,7 +150,7 @@ class E2ETestSuite:
                 )
                 
                 if resp.status in [200, 201]:
-                    data = await resp.json()
+                    data = await _read_json(resp)
                     # backend may return userId or user_id or id
                     has_id = any(k in data for k in ("user_id", "id", "userId")) or data.get("status") == "registered"
                     await self.assert_test(
@@ -106,9 +169,9 @@ class E2ETestSuite:
         print("\n--- Test 3: User Login ---")
         try:
             assert self.session is not None, "Session not initialized"
-            async with self.session.post(
+            async with self._post_json(
                 f"{self.base_url}/auth/login",
-                json={
+                {
                     "email": self.test_user["email"],
                     "password": self.test_user["password"]
                 }
@@ -120,7 +183,7 @@ class E2ETestSuite:
                 )
                 
                 if resp.status == 200:
-                    data = await resp.json()
+                    data = await _read_json(resp)
                     await self.assert_test(
                         "Login response has token",
                         any(k in data for k in ("token", "access_token", "accessToken", "accessToken")),
@@ -129,6 +192,8 @@ class E2ETestSuite:
                     # Store auth token (accept multiple field names)
                     self.auth_token = data.get("token") or data.get("access_token") or data.get("accessToken") or data.get("access_token")
                     if self.auth_token:
+                        # Sent by default on every later request from this session
+                        self.session.headers["Authorization"] = f"Bearer {self.auth_token}"
                         print(f"  [Auth] Token acquired: {self.auth_token[:20]}...")
         except Exception as e:
             await self.assert_test("User login", False, str(e))
@@ -137,21 +202,13 @@ class E2ETestSuite:
         """Test 4: Upload dataset (via analysis request)"""
         print("\n--- Test 4: Upload Dataset ---")
         
-        # Generate test dataset
-        dataset = self._generate_test_dataset(100)
-        
         try:
             assert self.session is not None, "Session not initialized"
-            headers = {}
-            if self.auth_token:
-                headers["Authorization"] = f"Bearer {self.auth_token}"
-            
             # The backend exposes /datasets/upload and /analyze (not /api/analyze)
             upload_payload = {"name": "test_dataset", "type": "generated"}
-            async with self.session.post(
+            async with self._post_json(
                 f"{self.base_url}/datasets/upload",
-                json=upload_payload,
-                headers=headers
+                upload_payload
             ) as resp:
                 await self.assert_test(
                     "Dataset upload status",
@@ -160,7 +217,7 @@ class E2ETestSuite:
                 )
                 
                 if resp.status in [200, 201, 202]:
-                    data = await resp.json()
+                    data = await _read_json(resp)
                     print(f"  [Upload] Response keys: {list(data.keys())}")
         except Exception as e:
             await self.assert_test("Upload dataset", False, str(e))
@@ -169,45 +226,15 @@ class E2ETestSuite:
         """Test 5: Run bias analysis"""
         print("\n--- Test 5: Run Analysis ---")
         
-        dataset = self._generate_test_dataset(100)
-        
         try:
             assert self.session is not None, "Session not initialized"
-            headers = {}
-            if self.auth_token:
-                headers["Authorization"] = f"Bearer {self.auth_token}"
-            
-            # Convert row-oriented dataset into column-oriented mapping expected by /analyze
-            cols = {}
-            for row in dataset:
-                for k, v in row.items():
-                    cols.setdefault(k, []).append(v)
-            # Encode categorical string columns to integer codes for AI Core
-            for col, vals in list(cols.items()):
-                if any(isinstance(x, str) for x in vals):
-                    mapping = {}
-                    new_vals = []
-                    for x in vals:
-                        if isinstance(x, str):
-                            if x not in mapping:
-                                mapping[x] = len(mapping)
-                            new_vals.append(mapping[x])
-                        else:
-                            new_vals.append(x)
-                    cols[col] = new_vals
-
-            # Drop identifier columns that are non-numeric (e.g., id)
-            if 'id' in cols:
-                del cols['id']
-
-            payload = {"dataset_name": "test_dataset", "data": cols}
+            payload = {"dataset_name": "test_dataset", "data": self.dataset}
             
             start_time = time.time()
             
-            async with self.session.post(
+            async with self._post_json(
                 f"{self.base_url}/analyze",
-                json=payload,
-                headers=headers,
+                payload,
                 timeout=aiohttp.ClientTimeout(total=60)
             ) as resp:
                 elapsed = time.time() - start_time
@@ -220,21 +247,20 @@ class E2ETestSuite:
                         ""
                     )
                 elif resp.status in [400, 500]:
-                    # Read body to decide if this is a fairness violation or informative failure
-                    try:
-                        body = await resp.json()
-                        body_text = json.dumps(body)
-                    except Exception:
-                        body_text = await resp.text()
-
-                    if any(k in body_text.lower() for k in ("fairness", "violation", "analysis failed", "violations")):
+                    # Scan the raw body (JSON or text) to decide if this is a fairness
+                    # violation or informative failure; no parse needed
+                    body = await resp.read()
+                    lowered = body.lower()
+
+                    if any(k in lowered for k in FAIRNESS_FAILURE_MARKERS):
                         # Treat as a soft pass (informative failure due to fairness checks)
                         await self.assert_test("Analysis status", True, f"Non-success status {resp.status} but contains fairness info")
                     else:
                         await self.assert_test(
                             "Analysis status",
                             False,
-                            f"Expected 200/201 or fairness-warning, got {resp.status} - {body_text}"
+                            f"Expected 200/201 or fairness-warning, got {resp.status} - "
+                            f"{body[:512].decode('utf-8', 'replace')}"
                         )
                 else:
                     await self.assert_test(
@@ -250,20 +276,21 @@ class E2ETestSuite:
                 )
                 
                 if resp.status in [200, 201]:
-                    data = await resp.json()
+                    data = await _read_json(resp)
                     
-                    # Verify response structure
-                    expected_keys = ["bias_metrics", "shap_values", "fairness_score"]
-                    has_required_keys = any(key in data for key in expected_keys)
+                    # Verify response structure: an expected key at the top level
+                    is_object = isinstance(data, dict)
+                    has_required_keys = is_object and any(key in data for key in ANALYSIS_KEYS)
+                    got = list(data.keys()) if is_object else type(data).__name__
                     
                     await self.assert_test(
                         "Analysis response structure",
-                        has_required_keys or "analysis_id" in data,
-                        f"Missing expected keys. Got: {list(data.keys())}"
+                        has_required_keys,
+                        f"Missing expected keys. Got: {got}"
                     )
                     
                     print(f"  [Analysis] Completed in {elapsed:.2f}s")
-                    if "analysis_id" in data:
+                    if is_object and "analysis_id" in data:
                         print(f"  [Analysis] ID: {data['analysis_id']}")
         except Exception as e:
             await self.assert_test("Run analysis", False, str(e))
@@ -274,15 +301,10 @@ class E2ETestSuite:
         
         try:
             assert self.session is not None, "Session not initialized"
-            headers = {}
-            if self.auth_token:
-                headers["Authorization"] = f"Bearer {self.auth_token}"
-            
             # Query reports for the logged-in user if available
             reports_path = f"{self.base_url}/reports/{self.user_id}" if self.user_id else f"{self.base_url}/reports"
             async with self.session.get(
-                reports_path,
-                headers=headers
+                reports_path
             ) as resp:
                 await self.assert_test(
                     "View results status",
@@ -291,7 +313,7 @@ class E2ETestSuite:
                 )
                 
                 if resp.status == 200:
-                    data = await resp.json()
+                    data = await _read_json(resp)
                     await self.assert_test(
                         "Results response is list",
                         isinstance(data, list) or "reports" in data,
@@ -308,18 +330,13 @@ class E2ETestSuite:
         # Full implementation would require getting a report ID first
         try:
             assert self.session is not None, "Session not initialized"
-            headers = {}
-            if self.auth_token:
-                headers["Authorization"] = f"Bearer {self.auth_token}"
-            
             # This might fail if no reports exist, but tests the endpoint
             reports_path = f"{self.base_url}/reports/{self.user_id}" if self.user_id else f"{self.base_url}/reports"
             async with self.session.get(
-                reports_path,
-                headers=headers
+                reports_path
             ) as resp:
                 if resp.status == 200:
-                    data = await resp.json()
+                    data = await _read_json(resp)
                     reports = data if isinstance(data, list) else data.get("reports", [])
                     
                     await self.assert_test(
@@ -339,23 +356,26 @@ class E2ETestSuite:
         except Exception as e:
             await self.assert_test("Export report", False, str(e))
 
-    def _generate_test_dataset(self, size: int = 100) -> list:
-        """Generate test dataset"""
-        data = []
-        for i in range(size):
-            data.append({
-                'id': f'test_{i}',
-                'credit_score': random.randint(500, 900),
-                'income': random.randint(30000, 130000),
-                'debt_to_income_ratio': round(random.random() * 0.6, 3),
-                'employment_years': random.randint(0, 30),
-                'existing_credit_lines': random.randint(0, 10),
-                'age': random.choice(['18-25', '26-35', '36-45', '46-55', '56+']),
-                'gender': random.choice(['male', 'female']),
-                'ethnicity': random.choice(['group_a', 'group_b', 'group_c']),
-                'approved': random.random() > 0.3
-            })
-        return data
+    def _generate_test_dataset(self, size: int = 100) -> Dict[str, list]:
+        """Generate a column-oriented test dataset in the shape /analyze expects.
+
+        Categorical columns are emitted directly as integer codes (indexes into
+        AGE_BUCKETS, GENDERS and ETHNICITIES).
+        """
+        rng = self.rng
+        columns = {
+            'credit_score': rng.integers(500, 901, size),
+            'income': rng.integers(30000, 130001, size),
+            'debt_to_income_ratio': np.round(rng.random(size) * 0.6, 3),
+            'employment_years': rng.integers(0, 31, size),
+            'existing_credit_lines': rng.integers(0, 11, size),
+            'age': rng.integers(0, len(AGE_BUCKETS), size),
+            'gender': rng.integers(0, len(GENDERS), size),
+            'ethnicity': rng.integers(0, len(ETHNICITIES), size),
+            'approved': rng.random(size) > 0.3,
+        }
+        # tolist() once at the boundary gives JSON-native ints/floats/bools
+        return {name: values.tolist() for name, values in columns.items()}
 
     async def run_all_tests(self):
         """Run all E2E tests"""
@@ -366,14 +386,17 @@ class E2ETestSuite:
         await self.setup()
         
         try:
-            # Run tests in order
+            # Auth flow is ordered; the remaining tests only need the token
             await self.test_health_check()
             await self.test_user_registration()
             await self.test_user_login()
-            await self.test_upload_dataset()
-            await self.test_run_analysis()
-            await self.test_view_results()
-            await self.test_export_report()
+            # assert_test never awaits, so concurrent result updates cannot interleave
+            await asyncio.gather(
+                self.test_upload_dataset(),
+                self.test_run_analysis(),
+                self.test_view_results(),
+                self.test_export_report(),
+            )
             
         finally:
             await self.teardown()
@@ -414,14 +437,19 @@ class E2ETestSuite:
         print("=" * 80)
         
         # Save results
-        with open("e2e_test_results.json", "w") as f:
-            json.dump({
-                "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
-                "success_rate": success_rate,
-                "passed": self.test_results["passed"],
-                "failed": self.test_results["failed"],
-                "errors": self.test_results["errors"]
-            }, f, indent=2)
+        results = {
+            "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "success_rate": success_rate,
+            "passed": self.test_results["passed"],
+            "failed": self.test_results["failed"],
+            "errors": self.test_results["errors"]
+        }
+        if orjson is not None:
+            with open("e2e_test_results.json", "wb") as f:
+                f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2))
+        else:
+            with open("e2e_test_results.json", "w") as f:
+                json.dump(results, f, indent=2)
         
         print(f"\nResults saved to: e2e_test_results.json")
 
@@ -432,11 +460,15 @@ async def main():
     
     parser = argparse.ArgumentParser(description='E2E Test Suite for EthixAI')
     parser.add_argument('--url', default='http://localhost:5000', help='Base URL')
+    parser.add_argument('--seed', type=int, default=None, help='Seed for the generated dataset')
     args = parser.parse_args()
     
-    suite = E2ETestSuite(base_url=args.url)
+    suite = E2ETestSuite(base_url=args.url, seed=args.seed)
     await suite.run_all_tests()
 
 
 if __name__ == '__main__':
-    asyncio.run(main())
+    if uvloop is not None:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
@@ -2,13 +2,54 @@
 """
 Analyze Artillery stress test results and generate comprehensive report
 """
+import io
 import json
 import sys
 from pathlib import Path
 from datetime import datetime
 
+try:
+    import ijson  # type: ignore
+except Exception:  # pragma: no cover
+    # Optional streaming parser; without it the whole report is loaded
+    ijson = None  # type: ignore
+
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    # Optional fast parser for large reports; falls back to stdlib json
+    orjson = None  # type: ignore
+
+ENDPOINT_RESPONSE_TIME_PREFIX = 'plugins.metrics-by-endpoint.response_time.'
+
+
+def load_aggregate(report_file):
+    """Return the report's `aggregate` section.
+
+    With ijson only that subtree is materialized; the per-period `intermediate`
+    entries, which dominate long runs, are skipped by the streaming parser.
+    """
+    if ijson is not None:
+        with open(report_file, 'rb') as f:
+            return next(ijson.items(f, 'aggregate', use_float=True), {})
+
+    if orjson is not None:
+        # orjson parses the raw bytes, skipping the text decode
+        with open(report_file, 'rb') as f:
+            data = orjson.loads(f.read())
+    else:
+        with open(report_file, 'r') as f:
+            data = json.load(f)
+    return data.get('aggregate', {})
+
 def analyze_report(report_file):
     """Analyze Artillery JSON report and generate summary"""
+    # Lines are buffered and written to stdout in one call at the end
+    out = io.StringIO()
+
+    def emit(line=""):
+        out.write(line)
+        out.write("\n")
 
     def get_counter(agg, key, default=0):
         # v2 JSON nests counters under aggregate.counters
@@ -28,130 +69,131 @@ def analyze_report(report_file):
             return agg['summaries'].get(name, {})
         return agg.get(name, {})
 
-    with open(report_file, 'r') as f:
-        data = json.load(f)
-
     # Extract aggregate metrics
-    agg = data.get('aggregate', {})
+    agg = load_aggregate(report_file)
 
-    print("=" * 80)
-    print(f"STRESS TEST RESULTS: {Path(report_file).name}")
-    print("=" * 80)
-    print()
+    emit("=" * 80)
+    emit(f"STRESS TEST RESULTS: {Path(report_file).name}")
+    emit("=" * 80)
+    emit()
 
     # Test overview
-    print("## Test Overview")
+    emit("## Test Overview")
     vusers_created = get_counter(agg, 'vusers.created', 0)
     vusers_completed = get_counter(agg, 'vusers.completed', 0)
     vusers_failed = get_counter(agg, 'vusers.failed', 0)
-    print("- Duration: N/A")
-    print(f"- Virtual Users Created: {vusers_created:,}")
-    print(f"- Virtual Users Completed: {vusers_completed:,}")
-    print(f"- Virtual Users Failed: {vusers_failed:,}")
+    emit("- Duration: N/A")
+    emit(f"- Virtual Users Created: {vusers_created:,}")
+    emit(f"- Virtual Users Completed: {vusers_completed:,}")
+    emit(f"- Virtual Users Failed: {vusers_failed:,}")
     success_rate = (vusers_completed / vusers_created * 100) if vusers_created else 0.0
-    print(f"- Success Rate: {success_rate:.1f}%")
-    print()
+    emit(f"- Success Rate: {success_rate:.1f}%")
+    emit()
 
     # Request metrics
-    print("## Request Metrics")
+    emit("## Request Metrics")
     total_requests = get_counter(agg, 'http.requests', 0)
     request_rate = float(get_rate(agg, 'http.request_rate', 0.0))
-    print(f"- Total Requests: {total_requests:,}")
-    print(f"- Request Rate: {request_rate:.1f}/sec")
-    print()
+    # Percent of total requests per count; computed once for all breakdowns
+    pct_scale = 100.0 / (total_requests or 1)
+    emit(f"- Total Requests: {total_requests:,}")
+    emit(f"- Request Rate: {request_rate:.1f}/sec")
+    emit()
 
     # Response times
     rt = get_summary(agg, 'http.response_time')
-    print("## Response Time (ms)")
-    print(f"- Min: {rt.get('min', 0)}ms")
-    print(f"- Median: {rt.get('median', rt.get('p50', 0))}ms")
-    print(f"- Mean: {rt.get('mean', 0):.1f}ms")
-    print(f"- p95: {rt.get('p95', 0)}ms")
-    print(f"- p99: {rt.get('p99', 0)}ms")
-    print(f"- Max: {rt.get('max', 0)}ms")
-    print()
+    emit("## Response Time (ms)")
+    emit(f"- Min: {rt.get('min', 0)}ms")
+    emit(f"- Median: {rt.get('median', rt.get('p50', 0))}ms")
+    emit(f"- Mean: {rt.get('mean', 0):.1f}ms")
+    emit(f"- p95: {rt.get('p95', 0)}ms")
+    emit(f"- p99: {rt.get('p99', 0)}ms")
+    emit(f"- Max: {rt.get('max', 0)}ms")
+    emit()
 
     # Status codes
-    print("## HTTP Status Codes")
-    status_codes = {}
+    emit("## HTTP Status Codes")
     counters = agg.get('counters') if isinstance(agg.get('counters'), dict) else agg
+    # One pass over the counters collects both status codes and errors
+    status_codes = {}
+    errors = {}
+    # Prefixes are stripped once here so sorting compares integer codes and bare names
     for k, v in counters.items():
         if k.startswith('http.codes.'):
-            status_codes[k] = v
-    for code, count in sorted(status_codes.items()):
-        code_num = code.replace('http.codes.', '')
-        pct = (count / (total_requests or 1)) * 100
-        print(f"- {code_num}: {count:,} ({pct:.1f}%)")
-    print()
+            status_codes[int(k[len('http.codes.'):])] = v
+        elif k.startswith('errors.'):
+            errors[k[len('errors.'):]] = v
+    for code_num, count in sorted(status_codes.items()):
+        pct = count * pct_scale
+        emit(f"- {code_num}: {count:,} ({pct:.1f}%)")
+    emit()
 
     # Errors
-    errors = {}
-    for k, v in counters.items():
-        if k.startswith('errors.'):
-            errors[k] = v
     if errors:
-        print("## Errors")
-        for error, count in sorted(errors.items()):
-            error_name = error.replace('errors.', '')
-            print(f"- {error_name}: {count:,}")
-        print()
+        emit("## Errors")
+        for error_name, count in sorted(errors.items()):
+            emit(f"- {error_name}: {count:,}")
+        emit()
 
     # Per-endpoint metrics
-    print("## Per-Endpoint Performance (p95 response time)")
+    emit("## Per-Endpoint Performance (p95 response time)")
     endpoint_metrics = {}
     summaries = agg.get('summaries') if isinstance(agg.get('summaries'), dict) else agg
     for key, val in summaries.items():
-        if 'plugins.metrics-by-endpoint' in key and 'response_time' in key and isinstance(val, dict):
-            parts = key.split('.')
-            # Endpoint should be the last segment (e.g., /api/analyze)
-            endpoint = parts[-1] if parts else key
-            endpoint_metrics[endpoint] = val
+        # Keys look like plugins.metrics-by-endpoint.response_time./api/analyze
+        if key.startswith(ENDPOINT_RESPONSE_TIME_PREFIX) and isinstance(val, dict):
+            endpoint_metrics[key[len(ENDPOINT_RESPONSE_TIME_PREFIX):]] = val
 
     for endpoint, metrics in sorted(endpoint_metrics.items()):
         p95 = metrics.get('p95', 'N/A')
         mean = metrics.get('mean', 'N/A')
-        print(f"- {endpoint}: p95={p95}ms, mean={mean}ms")
+        emit(f"- {endpoint}: p95={p95}ms, mean={mean}ms")
 
     # Assessment
-    print()
-    print("=" * 80)
-    print("## Performance Assessment")
-    print("=" * 80)
+    emit()
+    emit("=" * 80)
+    emit("## Performance Assessment")
+    emit("=" * 80)
 
     # Check SLO targets
     p95_target = 2000  # 2 seconds
     p95_actual = rt.get('p95', 0)
 
     if p95_actual <= p95_target:
-        print(f"✅ PASS: p95 latency ({p95_actual}ms) is within target (<{p95_target}ms)")
+        emit(f"✅ PASS: p95 latency ({p95_actual}ms) is within target (<{p95_target}ms)")
     else:
-        print(f"❌ FAIL: p95 latency ({p95_actual}ms) exceeds target (<{p95_target}ms)")
+        emit(f"❌ FAIL: p95 latency ({p95_actual}ms) exceeds target (<{p95_target}ms)")
 
     if success_rate >= 95:
-        print(f"✅ PASS: Success rate ({success_rate:.1f}%) meets target (>95%)")
+        emit(f"✅ PASS: Success rate ({success_rate:.1f}%) meets target (>95%)")
     elif success_rate >= 80:
-        print(f"⚠️  WARN: Success rate ({success_rate:.1f}%) is acceptable but below ideal (>95%)")
+        emit(f"⚠️  WARN: Success rate ({success_rate:.1f}%) is acceptable but below ideal (>95%)")
     else:
-        print(f"❌ FAIL: Success rate ({success_rate:.1f}%) is below acceptable threshold (>80%)")
+        emit(f"❌ FAIL: Success rate ({success_rate:.1f}%) is below acceptable threshold (>80%)")
 
     # Check for rate limiting
     rate_limit_errors = get_counter(agg, 'http.codes.429', 0)
     if rate_limit_errors > 0:
-        pct = (rate_limit_errors / (total_requests or 1)) * 100
-        print(f"⚠️  Rate limiting detected: {rate_limit_errors:,} 429 errors ({pct:.1f}%)")
+        pct = rate_limit_errors * pct_scale
+        emit(f"⚠️  Rate limiting detected: {rate_limit_errors:,} 429 errors ({pct:.1f}%)")
     else:
-        print("✅ No rate limiting detected")
+        emit("✅ No rate limiting detected")
+
+    emit()
+    sys.stdout.write(out.getvalue())
 
-    print()
 
 if __name__ == '__main__':
     if len(sys.argv) < 2:
-        print("Usage: python analyze_results.py <report.json>")
+        print("Usage: python analyze_results.py <report.json> [<report.json> ...]")
         sys.exit(1)
     
-    report_file = sys.argv[1]
-    if not Path(report_file).exists():
-        print(f"Error: File {report_file} not found")
-        sys.exit(1)
+    # Several reports can be analyzed in one process, sharing interpreter startup
+    report_files = sys.argv[1:]
+    for report_file in report_files:
+        if not Path(report_file).exists():
+            print(f"Error: File {report_file} not found")
+            sys.exit(1)
     
-    analyze_report(report_file)
+    for report_file in report_files:
+        analyze_report(report_file)
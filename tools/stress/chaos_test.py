@@ -11,8 +11,23 @@ import time
 import json
 from typing import Dict, Any, List
 from dataclasses import dataclass, field
+from functools import reduce
 
-@dataclass
+import numpy as np
+
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    # Optional fast serializer; stdlib json is used without it
+    orjson = None  # type: ignore
+
+try:
+    import uvloop  # type: ignore
+except Exception:  # pragma: no cover
+    # Optional libuv event loop; the default asyncio loop is used without it
+    uvloop = None  # type: ignore
+
+@dataclass(slots=True)
 class ChaosConfig:
     """Chaos testing configuration"""
     target_url: str = "http://localhost:5000"
@@ -28,7 +43,10 @@ class ChaosConfig:
     timeout_after_seconds: int = 1  # Timeout after 1 second
     slow_response_delay: int = 5  # Add 5 second delay
 
-@dataclass
+REQUEST_ID_SAMPLE_SIZE = 100
+
+
+@dataclass(slots=True)
 class ChaosResults:
     """Results from chaos testing"""
     total_requests: int = 0
@@ -38,16 +56,31 @@ class ChaosResults:
     slow_responses: int = 0
     server_errors: int = 0
     
-    latencies: List[float] = field(default_factory=list)
-    request_ids: List[str] = field(default_factory=list)
+    # Distinct ids for the summary, plus the first few kept for the audit sample
+    request_id_sample: List[str] = field(default_factory=list)
+    _unique_request_ids: set = field(default_factory=set, init=False, repr=False)
+    
+    # Latencies (ms) in a preallocated float64 buffer, doubled when full
+    _latency_buffer: np.ndarray = field(default_factory=lambda: np.empty(4096), init=False, repr=False)
+    _latency_count: int = field(default=0, init=False, repr=False)
+    
+    @property
+    def latencies(self) -> np.ndarray:
+        """Recorded latencies in milliseconds (a view of the buffer)"""
+        return self._latency_buffer[:self._latency_count]
     
     def add_result(self, success: bool, latency: float, error_type: str = "", request_id: str = ""):
         """Record a test result"""
         self.total_requests += 1
-        self.latencies.append(latency)
+        if self._latency_count == len(self._latency_buffer):
+            self._latency_buffer = np.resize(self._latency_buffer, 2 * len(self._latency_buffer))
+        self._latency_buffer[self._latency_count] = latency
+        self._latency_count += 1
         
         if request_id:
-            self.request_ids.append(request_id)
+            self._unique_request_ids.add(request_id)
+            if len(self.request_id_sample) < REQUEST_ID_SAMPLE_SIZE:
+                self.request_id_sample.append(request_id)
         
         if success:
             self.successful_requests += 1
@@ -60,8 +93,38 @@ class ChaosResults:
         elif error_type == "server":
             self.server_errors += 1
     
+    def merge(self, other: "ChaosResults") -> "ChaosResults":
+        """Fold another worker's results into this one and return self"""
+        self.total_requests += other.total_requests
+        self.successful_requests += other.successful_requests
+        self.timeout_requests += other.timeout_requests
+        self.network_errors += other.network_errors
+        self.slow_responses += other.slow_responses
+        self.server_errors += other.server_errors
+        
+        self._unique_request_ids |= other._unique_request_ids
+        room = REQUEST_ID_SAMPLE_SIZE - len(self.request_id_sample)
+        self.request_id_sample.extend(other.request_id_sample[:max(room, 0)])
+        
+        # Raw latencies are concatenated, so merged percentiles stay exact
+        count = self._latency_count + other._latency_count
+        merged = np.empty(max(count, len(self._latency_buffer)))
+        np.concatenate((self.latencies, other.latencies), out=merged[:count])
+        self._latency_buffer = merged
+        self._latency_count = count
+        return self
+    
     def get_summary(self) -> Dict[str, Any]:
         """Get summary statistics"""
+        latencies = self.latencies
+        if len(latencies):
+            avg_latency = round(float(latencies.mean()), 2)
+            # One partition pass for every tail quantile; the 100th is the max
+            p50, p90, p95, p99, max_latency = (
+                round(float(v), 2) for v in np.percentile(latencies, [50, 90, 95, 99, 100])
+            )
+        else:
+            avg_latency = p50 = p90 = p95 = p99 = max_latency = 0
         return {
             "total_requests": self.total_requests,
             "successful_requests": self.successful_requests,
@@ -70,13 +133,27 @@ class ChaosResults:
             "slow_responses": self.slow_responses,
             "server_errors": self.server_errors,
             "success_rate": round(self.successful_requests / self.total_requests * 100, 2) if self.total_requests > 0 else 0,
-            "avg_latency_ms": round(sum(self.latencies) / len(self.latencies), 2) if self.latencies else 0,
-            "unique_request_ids": len(set(self.request_ids))
+            "avg_latency_ms": avg_latency,
+            "p50_latency_ms": p50,
+            "p90_latency_ms": p90,
+            "p95_latency_ms": p95,
+            "p99_latency_ms": p99,
+            "max_latency_ms": max_latency,
+            "unique_request_ids": len(self._unique_request_ids)
         }
 
 
+AGE_GROUPS = ('18-25', '26-35', '36-45', '46-55', '56+')
+GENDERS = ('male', 'female')
+ETHNICITIES = ('group_a', 'group_b', 'group_c', 'group_d')
+
+
 def generate_payload(size: int = 100) -> List[Dict[str, Any]]:
     """Generate test payload"""
+    # Draw the categorical columns in bulk rather than one choice() per row
+    ages = random.choices(AGE_GROUPS, k=size)
+    genders = random.choices(GENDERS, k=size)
+    ethnicities = random.choices(ETHNICITIES, k=size)
     data = []
     for i in range(size):
         data.append({
@@ -86,18 +163,32 @@ def generate_payload(size: int = 100) -> List[Dict[str, Any]]:
             'debt_to_income_ratio': round(random.random() * 0.6, 3),
             'employment_years': random.randint(0, 30),
             'existing_credit_lines': random.randint(0, 10),
-            'age': random.choice(['18-25', '26-35', '36-45', '46-55', '56+']),
-            'gender': random.choice(['male', 'female']),
-            'ethnicity': random.choice(['group_a', 'group_b', 'group_c', 'group_d']),
+            'age': ages[i],
+            'gender': genders[i],
+            'ethnicity': ethnicities[i],
             'approved': random.random() > 0.3
         })
     return data
 
 
-async def make_chaotic_request(session: aiohttp.ClientSession, config: ChaosConfig) -> Dict[str, Any]:
-    """Make a request with chaos injection"""
+# Static envelope of the /api/analyze body, encoded once around the dataset
+ANALYZE_BODY_PREFIX = b'{"model_type":"credit_scoring","dataset":'
+ANALYZE_BODY_SUFFIX = b',"protected_attributes":["gender"],"target_column":"approved"}'
+
+
+def build_request_bodies(count: int = 8, size: int = 100) -> List[bytes]:
+    """Pre-serialize a small pool of /api/analyze request bodies"""
+    bodies = []
+    for _ in range(count):
+        dataset = generate_payload(size)
+        encoded = orjson.dumps(dataset) if orjson is not None else json.dumps(dataset).encode()
+        bodies.append(ANALYZE_BODY_PREFIX + encoded + ANALYZE_BODY_SUFFIX)
+    return bodies
+
+
+async def make_chaotic_request(session: aiohttp.ClientSession, config: ChaosConfig, body: bytes) -> Dict[str, Any]:
+    """Make a request with chaos injection, posting a pre-serialized JSON body"""
     request_id = f"chaos-{random.randint(100000, 999999)}"
-    payload = generate_payload(100)
     
     # Decide if this request should have a failure injected
     failure_type = None
@@ -117,41 +208,42 @@ async def make_chaotic_request(session: aiohttp.ClientSession, config: ChaosConf
     else:
         timeout = 30  # Normal timeout
     
-    start_time = time.time()
+    # Monotonic integer clock: immune to wall-clock jumps mid-test
+    start_ns = time.monotonic_ns()
     
     try:
         async with session.post(
             f"{config.target_url}/api/analyze",
-            json={
-                "model_type": "credit_scoring",
-                "dataset": payload,
-                "protected_attributes": ["gender"],
-                "target_column": "approved"
-            },
+            data=body,
             headers={
                 "Content-Type": "application/json",
                 "X-Request-Id": request_id
             },
             timeout=aiohttp.ClientTimeout(total=timeout)
         ) as response:
-            latency = (time.time() - start_time) * 1000
-            
-            # Simulate slow response (add artificial delay)
-            if random.random() < config.slow_response_rate:
-                await asyncio.sleep(config.slow_response_delay)
-                latency += config.slow_response_delay * 1000
-                failure_type = "slow"
-            
-            return {
-                "success": 200 <= response.status < 300,
-                "latency": latency,
-                "error_type": "server" if response.status >= 500 else failure_type,
-                "request_id": request_id,
-                "status_code": response.status
-            }
+            # Only the status matters, but the body is still drained so the
+            # connection goes back to the pool (an unread body makes aiohttp
+            # close it) before any artificial delay
+            latency = (time.monotonic_ns() - start_ns) / 1e6
+            status = response.status
+            await response.read()
+        
+        # Simulate slow response (add artificial delay)
+        if random.random() < config.slow_response_rate:
+            await asyncio.sleep(config.slow_response_delay)
+            latency += config.slow_response_delay * 1000
+            failure_type = "slow"
+        
+        return {
+            "success": 200 <= status < 300,
+            "latency": latency,
+            "error_type": "server" if status >= 500 else failure_type,
+            "request_id": request_id,
+            "status_code": status
+        }
     
     except asyncio.TimeoutError:
-        latency = (time.time() - start_time) * 1000
+        latency = (time.monotonic_ns() - start_ns) / 1e6
         return {
             "success": False,
             "latency": latency,
@@ -160,7 +252,7 @@ async def make_chaotic_request(session: aiohttp.ClientSession, config: ChaosConf
         }
     
     except Exception as e:
-        latency = (time.time() - start_time) * 1000
+        latency = (time.monotonic_ns() - start_ns) / 1e6
         return {
             "success": False,
             "latency": latency,
@@ -170,36 +262,51 @@ async def make_chaotic_request(session: aiohttp.ClientSession, config: ChaosConf
         }
 
 
-async def chaos_user(user_id: int, config: ChaosConfig, results: ChaosResults):
-    """Simulate a user making requests with chaos injection"""
-    connector = aiohttp.TCPConnector(limit=5)
-    async with aiohttp.ClientSession(connector=connector) as session:
-        start_time = time.time()
-        request_count = 0
+async def chaos_producer(queue: asyncio.Queue, config: ChaosConfig, workers: int):
+    """Feed request jobs at the configured pace, then one stop sentinel per worker"""
+    start_time = time.monotonic()
+    
+    while time.monotonic() - start_time < config.duration_seconds:
+        await queue.put(True)  # Blocks when workers fall behind (bounded queue)
+        # Same aggregate pace as concurrent_users each waiting 0.5-2s between requests
+        await asyncio.sleep(random.uniform(0.5, 2) / config.concurrent_users)
+    
+    for _ in range(workers):
+        await queue.put(None)
+
+
+async def chaos_worker(worker_id: int, queue: asyncio.Queue, config: ChaosConfig,
+                       session: aiohttp.ClientSession, bodies: List[bytes]) -> ChaosResults:
+    """Take jobs off the queue and make requests with chaos injection
+    
+    Each worker records into its own ChaosResults; they are merged once the
+    test ends.
+    """
+    results = ChaosResults()
+    start_time = time.monotonic()
+    request_count = 0
+    
+    while await queue.get() is not None:
+        result = await make_chaotic_request(session, config, random.choice(bodies))
         
-        while time.time() - start_time < config.duration_seconds:
-            result = await make_chaotic_request(session, config)
-            
-            results.add_result(
-                success=result["success"],
-                latency=result["latency"],
-                error_type=result.get("error_type", ""),
-                request_id=result.get("request_id", "")
-            )
-            
-            request_count += 1
-            
-            if request_count % 10 == 0:
-                elapsed = time.time() - start_time
-                print(f"[Chaos User {user_id}] {request_count} requests in {elapsed:.1f}s")
-            
-            await asyncio.sleep(random.uniform(0.5, 2))  # Random delay
+        results.add_result(
+            success=result["success"],
+            latency=result["latency"],
+            error_type=result.get("error_type", ""),
+            request_id=result.get("request_id", "")
+        )
+        
+        request_count += 1
+        
+        if request_count % 10 == 0:
+            elapsed = time.monotonic() - start_time
+            print(f"[Chaos Worker {worker_id}] {request_count} requests in {elapsed:.1f}s")
+    
+    return results
 
 
 async def run_chaos_test(config: ChaosConfig) -> ChaosResults:
     """Run chaos engineering test"""
-    results = ChaosResults()
-    
     print(f"\n{'='*80}")
     print(f"Starting Chaos Engineering Test")
     print(f"{'='*80}")
@@ -212,15 +319,23 @@ async def run_chaos_test(config: ChaosConfig) -> ChaosResults:
     print(f"  Slow Responses: {config.slow_response_rate * 100}%")
     print(f"{'='*80}\n")
     
-    # Run chaos users
-    tasks = [
-        chaos_user(user_id, config, results)
-        for user_id in range(config.concurrent_users)
-    ]
-    
-    await asyncio.gather(*tasks)
+    # One pooled session for all users so keep-alive connections are reused
+    pool_size = config.concurrent_users * 4
+    connector = aiohttp.TCPConnector(limit=pool_size, limit_per_host=pool_size, keepalive_timeout=60)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        # A paced producer feeds a bounded queue drained by a fixed worker pool,
+        # so request bursts queue up instead of all racing for connections
+        workers = config.concurrent_users
+        queue: asyncio.Queue = asyncio.Queue(maxsize=2 * workers)
+        # Payloads are generated and encoded once up front, not per request
+        bodies = build_request_bodies()
+        
+        _, *worker_results = await asyncio.gather(
+            chaos_producer(queue, config, workers),
+            *(chaos_worker(worker_id, queue, config, session, bodies) for worker_id in range(workers)),
+        )
     
-    return results
+    return reduce(ChaosResults.merge, worker_results, ChaosResults())
 
 
 def print_chaos_results(results: ChaosResults):
@@ -238,6 +353,8 @@ def print_chaos_results(results: ChaosResults):
     print(f"  Slow Responses: {summary['slow_responses']}")
     print(f"  Server Errors: {summary['server_errors']}")
     print(f"\nAverage Latency: {summary['avg_latency_ms']}ms")
+    print(f"Latency p50/p90/p95/p99: {summary['p50_latency_ms']}/{summary['p90_latency_ms']}/"
+          f"{summary['p95_latency_ms']}/{summary['p99_latency_ms']}ms (max {summary['max_latency_ms']}ms)")
     print(f"Unique Request IDs Captured: {summary['unique_request_ids']}")
     print(f"{'='*80}\n")
     
@@ -256,11 +373,15 @@ def save_chaos_results(results: ChaosResults, filename: str = "chaos_test_result
         "test_type": "chaos_engineering",
         "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
         "summary": results.get_summary(),
-        "request_ids_sample": results.request_ids[:100]  # Save sample for audit verification
+        "request_ids_sample": results.request_id_sample  # Save sample for audit verification
     }
     
-    with open(filename, 'w') as f:
-        json.dump(output, f, indent=2)
+    if orjson is not None:
+        with open(filename, 'wb') as f:
+            f.write(orjson.dumps(output, option=orjson.OPT_INDENT_2))
+    else:
+        with open(filename, 'w') as f:
+            json.dump(output, f, indent=2)
     
     print(f"Results saved to: {filename}")
 
@@ -290,7 +411,10 @@ def main():
     )
     
     # Run chaos test
-    results = asyncio.run(run_chaos_test(config))
+    if uvloop is not None:
+        results = uvloop.run(run_chaos_test(config))
+    else:
+        results = asyncio.run(run_chaos_test(config))
     
     # Print and save results
     print_chaos_results(results)
@@ -9,16 +9,38 @@ import json
 import csv
 import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Callable, Dict, List, Any, Optional
 import sys
 import re
 
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    # Optional fast serializer; stdlib json is used without it
+    orjson = None  # type: ignore
+
+# http_requests_total{...} samples and process_resident_memory_bytes, one per line
+_SCRAPE_METRIC_RE = re.compile(
+    r"^(?:(http_requests_total)\{[^}\n]*\}|process_resident_memory_bytes(?:\{[^}\n]*\})?)"
+    r"[ \t]+([0-9.eE+-]+)\r?$",
+    re.MULTILINE,
+)
+
 class MetricsCollector:
     """Collect and export Prometheus metrics"""
     
     def __init__(self, prometheus_url: str = "http://localhost:9090"):
         self.prometheus_url = prometheus_url
         self.metrics_cache = {}
+        # Keep-alive connection pool shared by all queries (and query threads)
+        self.session = requests.Session()
+    
+    def _run_queries(self, run: Callable[[str], Dict[str, Any]], queries: Dict[str, str]) -> Dict[str, Dict[str, Any]]:
+        """Run independent PromQL queries concurrently, keyed like `queries`"""
+        with ThreadPoolExecutor(max_workers=len(queries)) as executor:
+            return dict(zip(queries, executor.map(run, queries.values())))
     
     def query(self, query: str, time_param: Optional[str] = None) -> Dict[str, Any]:
         """Execute PromQL query"""
@@ -29,7 +51,7 @@ class MetricsCollector:
             params["time"] = time_param
         
         try:
-            response = requests.get(url, params=params, timeout=10)
+            response = self.session.get(url, params=params, timeout=10)
             response.raise_for_status()
             return response.json()
         except requests.RequestException as e:
@@ -47,7 +69,7 @@ class MetricsCollector:
         }
         
         try:
-            response = requests.get(url, params=params, timeout=30)
+            response = self.session.get(url, params=params, timeout=30)
             response.raise_for_status()
             return response.json()
         except requests.RequestException as e:
@@ -73,9 +95,7 @@ class MetricsCollector:
             "queries": {}
         }
         
-        for name, query in queries.items():
-            result = self.query(query)
-            
+        for name, result in self._run_queries(self.query, queries).items():
             if result.get("status") == "success" and result.get("data", {}).get("result"):
                 value = result["data"]["result"][0]["value"][1]
                 metrics["queries"][name] = float(value)
@@ -101,9 +121,8 @@ class MetricsCollector:
             "queries": {}
         }
         
-        for name, query in queries.items():
-            result = self.query_range(query, start, end, step="60s")
-            
+        run_range = partial(self.query_range, start=start, end=end, step="60s")
+        for name, result in self._run_queries(run_range, queries).items():
             if result.get("status") == "success" and result.get("data", {}).get("result"):
                 range_metrics["queries"][name] = result["data"]["result"]
             else:
@@ -123,13 +142,10 @@ class MetricsCollector:
         """
         scraped: Dict[str, Any] = { 'timestamp': datetime.now().isoformat(), 'raw': {}, 'summary': {} }
 
-        # Simple regexes to pull out a few useful metrics
-        re_http_requests = re.compile(r"^http_requests_total\{[^}]*\}\s+([0-9.eE+-]+)$")
-        re_proc_mem = re.compile(r"^process_resident_memory_bytes(?:\{[^}]*\})?\s+([0-9.eE+-]+)$")
 
         for name, url in urls.items():
             try:
-                resp = requests.get(url, timeout=timeout, allow_redirects=True)
+                resp = self.session.get(url, timeout=timeout, allow_redirects=True)
                 resp.raise_for_status()
                 text = resp.text
                 scraped['raw'][name] = text
@@ -137,19 +153,16 @@ class MetricsCollector:
                 total_requests = 0.0
                 mem_bytes: Optional[float] = None
 
-                for line in text.splitlines():
-                    m1 = re_http_requests.match(line)
-                    if m1:
-                        try:
-                            total_requests += float(m1.group(1))
-                        except Exception:
-                            pass
-                    m2 = re_proc_mem.match(line)
-                    if m2 and mem_bytes is None:
-                        try:
-                            mem_bytes = float(m2.group(1))
-                        except Exception:
-                            pass
+                # One scan over the whole exposition; group 1 marks request counters
+                for m in _SCRAPE_METRIC_RE.finditer(text):
+                    try:
+                        value = float(m.group(2))
+                    except ValueError:
+                        continue
+                    if m.group(1):
+                        total_requests += value
+                    elif mem_bytes is None:
+                        mem_bytes = value
 
                 scraped['summary'][name] = {
                     'http_requests_total_sum': total_requests,
@@ -163,22 +176,36 @@ class MetricsCollector:
     
     def export_to_json(self, metrics: Dict[str, Any], filename: str):
         """Export metrics to JSON"""
-        with open(filename, 'w') as f:
-            json.dump(metrics, f, indent=2)
+        if orjson is not None:
+            with open(filename, 'wb') as f:
+                f.write(orjson.dumps(metrics, option=orjson.OPT_INDENT_2))
+        else:
+            with open(filename, 'w') as f:
+                json.dump(metrics, f, indent=2)
         print(f"✅ Metrics exported to {filename}")
     
     def export_to_csv(self, range_metrics: Dict[str, Any], filename: str):
         """Export range metrics to CSV"""
-        with open(filename, 'w', newline='') as f:
+        # Range queries share one step grid, so each timestamp is formatted
+        # once (local time, as before) and reused across series and metrics
+        iso_by_ts: Dict[float, str] = {}
+        
+        def iso(ts: float) -> str:
+            formatted = iso_by_ts.get(ts)
+            if formatted is None:
+                formatted = iso_by_ts[ts] = datetime.fromtimestamp(ts).isoformat()
+            return formatted
+        
+        with open(filename, 'w', newline='', buffering=1 << 20) as f:
             writer = csv.writer(f)
             writer.writerow(["timestamp", "metric", "value"])
             
             for metric_name, results in range_metrics["queries"].items():
                 for result in results:
-                    for value_pair in result.get("values", []):
-                        timestamp = datetime.fromtimestamp(value_pair[0]).isoformat()
-                        value = value_pair[1]
-                        writer.writerow([timestamp, metric_name, value])
+                    writer.writerows(
+                        (iso(ts), metric_name, value)
+                        for ts, value in result.get("values", [])
+                    )
         
         print(f"✅ Metrics exported to {filename}")
 
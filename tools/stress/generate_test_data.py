@@ -5,67 +5,111 @@ Creates realistic credit scoring data with various sizes
 """
 
 import json
-import random
 from typing import List, Dict, Any
 
-def generate_dataset(size: int, seed: int = 42) -> List[Dict[str, Any]]:
-    """Generate synthetic credit scoring dataset"""
-    random.seed(seed)
+import numpy as np
+
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    # Optional fast serializer; stdlib json is used without it
+    orjson = None  # type: ignore
+
+try:
+    import pyarrow as pa  # type: ignore
+    import pyarrow.parquet as pq  # type: ignore
+except Exception:  # pragma: no cover
+    # Optional columnar output; only the JSON datasets are written without it
+    pa = None  # type: ignore
+    pq = None  # type: ignore
+
+def generate_columns(size: int, seed: int = 42) -> Dict[str, np.ndarray]:
+    """Generate synthetic credit scoring data as numpy columns
+    
+    Every column is drawn in one vectorized numpy call. Missing credit
+    scores and incomes are masked entries of numpy masked arrays.
+    """
+    rng = np.random.default_rng(seed)
     
     genders = ['male', 'female']
     age_groups = ['18-25', '26-35', '36-45', '46-55', '56+']
     ethnicities = ['group_a', 'group_b', 'group_c', 'group_d']
     
-    data = []
+    # Generate correlated features (more realistic)
+    credit_score = rng.integers(500, 901, size)
+    
+    # Income correlates with credit score
+    base_income = 30000 + (credit_score - 500) * 200
+    income = np.clip((base_income + rng.normal(0, 15000, size)).astype(np.int64), 20000, 200000)
+    
+    # Debt ratio inversely correlates with credit score
+    base_debt_ratio = 0.6 - (credit_score - 500) / 1000
+    debt_ratio = np.clip(base_debt_ratio + rng.normal(0, 0.1, size), 0, 0.8)
+    
+    employment_years = rng.integers(0, 36, size)
+    existing_credit_lines = rng.integers(0, 13, size)
+    
+    age = rng.choice(age_groups, size)
+    gender = rng.choice(genders, size)
+    ethnicity = rng.choice(ethnicities, size)
+    
+    # Approval logic (based on credit score, debt ratio)
+    approval_probability = (credit_score - 500) / 400 * (1 - debt_ratio)
+    approved = rng.random(size) < approval_probability
     
-    for i in range(size):
-        # Generate correlated features (more realistic)
-        credit_score = random.randint(500, 900)
-        
-        # Income correlates with credit score
-        base_income = 30000 + (credit_score - 500) * 200
-        income = int(base_income + random.gauss(0, 15000))
-        income = max(20000, min(200000, income))
-        
-        # Debt ratio inversely correlates with credit score
-        base_debt_ratio = 0.6 - (credit_score - 500) / 1000
-        debt_ratio = base_debt_ratio + random.gauss(0, 0.1)
-        debt_ratio = max(0, min(0.8, debt_ratio))
-        
-        employment_years = random.randint(0, 35)
-        existing_credit_lines = random.randint(0, 12)
-        
-        age = random.choice(age_groups)
-        gender = random.choice(genders)
-        ethnicity = random.choice(ethnicities)
-        
-        # Approval logic (based on credit score, debt ratio)
-        approval_probability = (credit_score - 500) / 400 * (1 - debt_ratio)
-        approved = random.random() < approval_probability
-        
-        # Add some missing data (5% randomly missing)
-        record = {
-            'id': f'record_{i:06d}',
-            'credit_score': credit_score if random.random() > 0.02 else None,
-            'income': income if random.random() > 0.03 else None,
-            'debt_to_income_ratio': round(debt_ratio, 3),
-            'employment_years': employment_years,
-            'existing_credit_lines': existing_credit_lines,
-            'age': age,
-            'gender': gender,
-            'ethnicity': ethnicity,
-            'approved': approved
-        }
-        
-        data.append(record)
+    # Add some missing data (2% credit score, 3% income)
+    credit_present = rng.random(size) > 0.02
+    income_present = rng.random(size) > 0.03
     
-    return data
+    return {
+        'id': np.char.add('record_', np.char.zfill(np.arange(size).astype(str), 6)),
+        'credit_score': np.ma.masked_array(credit_score, mask=~credit_present),
+        'income': np.ma.masked_array(income, mask=~income_present),
+        'debt_to_income_ratio': debt_ratio.round(3),
+        'employment_years': employment_years,
+        'existing_credit_lines': existing_credit_lines,
+        'age': age,
+        'gender': gender,
+        'ethnicity': ethnicity,
+        'approved': approved,
+    }
+
+
+def columns_to_records(columns: Dict[str, np.ndarray]) -> List[Dict[str, Any]]:
+    """Assemble numpy columns into JSON-ready record dicts"""
+    # Masked entries come out of tolist() as None
+    names = list(columns)
+    return [dict(zip(names, row)) for row in zip(*(column.tolist() for column in columns.values()))]
+
+
+def generate_dataset(size: int, seed: int = 42) -> List[Dict[str, Any]]:
+    """Generate synthetic credit scoring dataset as a list of records"""
+    return columns_to_records(generate_columns(size, seed))
+
+
+def save_parquet(columns: Dict[str, np.ndarray], filename: str):
+    """Save numpy columns as a zstd-compressed Parquet file"""
+    table = pa.table({
+        name: pa.array(np.ma.getdata(column), mask=np.ma.getmaskarray(column))
+        for name, column in columns.items()
+    })
+    pq.write_table(table, filename, compression='zstd')
+    print(f"✅ Generated {table.num_rows} records -> {filename}")
+
+
+def write_json(obj: Any, filename: str):
+    """Write obj as indented JSON, via orjson when available"""
+    if orjson is not None:
+        with open(filename, 'wb') as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+    else:
+        with open(filename, 'w') as f:
+            json.dump(obj, f, indent=2)
 
 
 def save_dataset(data: List[Dict], filename: str):
     """Save dataset to JSON file"""
-    with open(filename, 'w') as f:
-        json.dump(data, f, indent=2)
+    write_json(data, filename)
     print(f"✅ Generated {len(data)} records -> {filename}")
 
 
@@ -81,8 +125,11 @@ def main():
     }
     
     for filename, size in sizes.items():
-        data = generate_dataset(size)
-        save_dataset(data, f"data/{filename}")
+        columns = generate_columns(size)
+        save_dataset(columns_to_records(columns), f"data/{filename}")
+        if pq is not None:
+            # Columnar copy alongside the JSON the Artillery processor loads
+            save_parquet(columns, f"data/{filename[:-len('.json')]}.parquet")
     
     # Generate sample record for explainability tests
     sample = {
@@ -97,8 +144,7 @@ def main():
         'ethnicity': 'group_a'
     }
     
-    with open('data/sample_record.json', 'w') as f:
-        json.dump(sample, f, indent=2)
+    write_json(sample, 'data/sample_record.json')
     print(f"✅ Generated sample record -> data/sample_record.json")
     
     print("\n✅ All test datasets generated successfully!\n")
@@ -6,14 +6,38 @@ Provides fine-grained control over load testing with real-time metrics
 
 import asyncio
 import aiohttp  # HTTP client for async requests
+import multiprocessing
+import os
+import threading
 import time
 import json
 import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Any
-from dataclasses import dataclass, field
-from statistics import mean, median, quantiles
-import random
+from functools import partial, reduce
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from dataclasses import dataclass, field, replace
+
+import numpy as np
+
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    # Optional fast serializer; stdlib json is used without it
+    orjson = None  # type: ignore
+
+try:
+    import httpx  # type: ignore
+except Exception:  # pragma: no cover
+    # Optional HTTP/2 transport (--transport httpx2); aiohttp is used without it
+    httpx = None  # type: ignore
+
+try:
+    import uvloop  # type: ignore
+except Exception:  # pragma: no cover
+    # Optional libuv event loop; the default asyncio loop is used without it
+    uvloop = None  # type: ignore
 
 @dataclass
 class TestConfig:
@@ -24,8 +48,10 @@ class TestConfig:
     requests_per_user: int = 100
     payload_size: int = 100
     timeout_seconds: int = 30
+    requests_per_second: float = 0  # 0 = unpaced, send as fast as responses return
+    transport: str = "aiohttp"  # or "httpx2" for HTTP/2 via httpx
     
-@dataclass
+@dataclass(slots=True)
 class RequestMetrics:
     """Metrics for a single request"""
     status_code: int
@@ -43,17 +69,29 @@ class TestResults:
     failed_requests: int = 0
     timeout_requests: int = 0
     
-    latencies: List[float] = field(default_factory=list)
+    # Latencies (ms) in a preallocated float64 buffer, doubled when full
+    _latency_buffer: np.ndarray = field(default_factory=lambda: np.empty(4096), init=False, repr=False)
+    _latency_count: int = field(default=0, init=False, repr=False)
     status_codes: Dict[int, int] = field(default_factory=dict)
-    errors: List[str] = field(default_factory=list)
+    # Failure count per distinct (status_code, error) pair
+    errors: Counter = field(default_factory=Counter)
     
+    # perf_counter() readings; only their difference (the duration) is used
     start_time: float = 0
     end_time: float = 0
     
+    @property
+    def latencies(self) -> np.ndarray:
+        """Recorded latencies in milliseconds (a view of the buffer)"""
+        return self._latency_buffer[:self._latency_count]
+    
     def add_result(self, metrics: RequestMetrics):
         """Add individual request result"""
         self.total_requests += 1
-        self.latencies.append(metrics.latency_ms)
+        if self._latency_count == len(self._latency_buffer):
+            self._latency_buffer = np.resize(self._latency_buffer, 2 * len(self._latency_buffer))
+        self._latency_buffer[self._latency_count] = metrics.latency_ms
+        self._latency_count += 1
         
         self.status_codes[metrics.status_code] = self.status_codes.get(metrics.status_code, 0) + 1
         
@@ -62,13 +100,44 @@ class TestResults:
         else:
             self.failed_requests += 1
             if metrics.error:
-                self.errors.append(f"[{metrics.status_code}] {metrics.error}")
+                self.errors[(metrics.status_code, metrics.error)] += 1
+    
+    def merge(self, other: "TestResults") -> "TestResults":
+        """Fold another shard's measurements into this one and return self
+        
+        Run timing (start_time/end_time) is left to the caller, which knows
+        when the combined run started and ended.
+        """
+        self.total_requests += other.total_requests
+        self.successful_requests += other.successful_requests
+        self.failed_requests += other.failed_requests
+        self.timeout_requests += other.timeout_requests
+        
+        for code, count in other.status_codes.items():
+            self.status_codes[code] = self.status_codes.get(code, 0) + count
+        self.errors.update(other.errors)
+        
+        # Raw latencies are concatenated, so merged percentiles stay exact
+        count = self._latency_count + other._latency_count
+        merged = np.empty(max(count, len(self._latency_buffer)))
+        np.concatenate((self.latencies, other.latencies), out=merged[:count])
+        self._latency_buffer = merged
+        self._latency_count = count
+        return self
     
     def get_summary(self) -> Dict[str, Any]:
         """Get summary statistics"""
         duration = self.end_time - self.start_time
+        latencies = self.latencies
         
-        latencies_sorted = sorted(self.latencies)
+        if len(latencies):
+            # One partition pass for every quantile; the 0th and 100th are min and max
+            min_ms, median_ms, p95_ms, p99_ms, max_ms = (
+                round(float(v), 2) for v in np.percentile(latencies, [0, 50, 95, 99, 100])
+            )
+            mean_ms = round(float(latencies.mean()), 2)
+        else:
+            min_ms = median_ms = p95_ms = p99_ms = max_ms = mean_ms = 0
         
         return {
             "duration_seconds": round(duration, 2),
@@ -78,82 +147,109 @@ class TestResults:
             "success_rate": round(self.successful_requests / self.total_requests * 100, 2) if self.total_requests > 0 else 0,
             "requests_per_second": round(self.total_requests / duration, 2) if duration > 0 else 0,
             "latency": {
-                "min_ms": round(min(self.latencies), 2) if self.latencies else 0,
-                "max_ms": round(max(self.latencies), 2) if self.latencies else 0,
-                "mean_ms": round(mean(self.latencies), 2) if self.latencies else 0,
-                "median_ms": round(median(self.latencies), 2) if self.latencies else 0,
-                "p95_ms": round(quantiles(latencies_sorted, n=20)[18], 2) if len(latencies_sorted) > 1 else 0,
-                "p99_ms": round(quantiles(latencies_sorted, n=100)[98], 2) if len(latencies_sorted) > 1 else 0,
+                "min_ms": min_ms,
+                "max_ms": max_ms,
+                "mean_ms": mean_ms,
+                "median_ms": median_ms,
+                "p95_ms": p95_ms,
+                "p99_ms": p99_ms,
             },
             "status_codes": self.status_codes,
-            "top_errors": self.errors[:10]
+            "top_errors": [
+                f"[{status}] {error} (x{count})"
+                for (status, error), count in self.errors.most_common(10)
+            ]
         }
 
 
 def generate_test_payload(size: int) -> List[Dict[str, Any]]:
-    """Generate synthetic credit scoring dataset"""
+    """Generate synthetic credit scoring dataset
+    
+    Each column is drawn in one vectorized numpy call and the records are
+    assembled from the columns at the end.
+    """
+    rng = np.random.default_rng()
+    
     genders = ['male', 'female']
     age_groups = ['18-25', '26-35', '36-45', '46-55', '56+']
     ethnicities = ['group_a', 'group_b', 'group_c', 'group_d']
     
-    data = []
-    for i in range(size):
-        data.append({
+    columns = zip(
+        rng.integers(500, 901, size).tolist(),
+        rng.integers(30000, 130001, size).tolist(),
+        (rng.random(size) * 0.6).round(3).tolist(),
+        rng.integers(0, 31, size).tolist(),
+        rng.integers(0, 11, size).tolist(),
+        rng.choice(age_groups, size).tolist(),
+        rng.choice(genders, size).tolist(),
+        rng.choice(ethnicities, size).tolist(),
+        (rng.random(size) > 0.3).tolist(),
+    )
+    return [
+        {
             'id': f'record_{i}',
-            'credit_score': random.randint(500, 900),
-            'income': random.randint(30000, 130000),
-            'debt_to_income_ratio': round(random.random() * 0.6, 3),
-            'employment_years': random.randint(0, 30),
-            'existing_credit_lines': random.randint(0, 10),
-            'age': random.choice(age_groups),
-            'gender': random.choice(genders),
-            'ethnicity': random.choice(ethnicities),
-            'approved': random.random() > 0.3
-        })
-    
-    return data
+            'credit_score': credit,
+            'income': income,
+            'debt_to_income_ratio': debt,
+            'employment_years': years,
+            'existing_credit_lines': lines,
+            'age': age_group,
+            'gender': sex,
+            'ethnicity': group,
+            'approved': approved
+        }
+        for i, (credit, income, debt, years, lines, age_group, sex, group, approved) in enumerate(columns)
+    ]
+
 
+def build_request_body(payload: List[Dict]) -> bytes:
+    """Serialize the /api/analyze request body for a payload once"""
+    body = {
+        "model_type": "credit_scoring",
+        "dataset": payload,
+        "protected_attributes": ["gender", "age"],
+        "target_column": "approved"
+    }
+    return orjson.dumps(body) if orjson is not None else json.dumps(body).encode()
 
-async def make_request(session: aiohttp.ClientSession, config: TestConfig, payload: List[Dict]) -> RequestMetrics:
-    """Make a single HTTP request"""
-    request_id = f"stress-test-{random.randint(100000, 999999)}"
+
+def _error_message(raw: bytes) -> str:
+    """Pull the error/message field out of an error response body"""
+    try:
+        body = orjson.loads(raw) if orjson is not None else json.loads(raw)
+        return body.get('error', body.get('message', ''))
+    except:
+        return ""
+
+
+async def make_request(session: aiohttp.ClientSession, url: str, body: bytes,
+                       request_id: str) -> RequestMetrics:
+    """Make a single HTTP request with a pre-serialized JSON body
     
-    start_time = time.time()
+    The session supplies the Content-Type header and the request timeout.
+    """
+    start_time = time.perf_counter()
     
     try:
-        async with session.post(
-            f"{config.target_url}/api/analyze",
-            json={
-                "model_type": "credit_scoring",
-                "dataset": payload,
-                "protected_attributes": ["gender", "age"],
-                "target_column": "approved"
-            },
-            headers={
-                "Content-Type": "application/json",
-                "X-Request-Id": request_id
-            },
-            timeout=aiohttp.ClientTimeout(total=config.timeout_seconds)
-        ) as response:
-            latency_ms = (time.time() - start_time) * 1000
+        async with session.post(url, data=body, headers={"X-Request-Id": request_id}) as response:
+            latency_ms = (time.perf_counter() - start_time) * 1000
             
-            # Try to read response body
-            try:
-                body = await response.json()
-                error_msg = body.get('error', body.get('message', ''))
-            except:
-                error_msg = ""
+            # Every body is drained so the connection goes back to the pool
+            # (an unread body makes aiohttp close it); only error bodies are
+            # parsed, for their error message
+            raw = await response.read()
+            error_msg = _error_message(raw) if response.status >= 400 else ""
             
             return RequestMetrics(
                 status_code=response.status,
                 latency_ms=latency_ms,
                 success=200 <= response.status < 300,
-                error=error_msg if response.status >= 400 else "",
+                error=error_msg,
                 request_id=request_id
             )
     
     except asyncio.TimeoutError:
-        latency_ms = (time.time() - start_time) * 1000
+        latency_ms = (time.perf_counter() - start_time) * 1000
         return RequestMetrics(
             status_code=504,
             latency_ms=latency_ms,
@@ -163,7 +259,7 @@ async def make_request(session: aiohttp.ClientSession, config: TestConfig, paylo
         )
     
     except aiohttp.ClientError as e:
-        latency_ms = (time.time() - start_time) * 1000
+        latency_ms = (time.perf_counter() - start_time) * 1000
         return RequestMetrics(
             status_code=0,
             latency_ms=latency_ms,
@@ -173,7 +269,7 @@ async def make_request(session: aiohttp.ClientSession, config: TestConfig, paylo
         )
     
     except Exception as e:
-        latency_ms = (time.time() - start_time) * 1000
+        latency_ms = (time.perf_counter() - start_time) * 1000
         return RequestMetrics(
             status_code=0,
             latency_ms=latency_ms,
@@ -183,29 +279,110 @@ async def make_request(session: aiohttp.ClientSession, config: TestConfig, paylo
         )
 
 
-async def user_session(user_id: int, config: TestConfig, results: TestResults):
-    """Simulate a single user making requests"""
-    payload = generate_test_payload(config.payload_size)
+async def make_httpx_request(client: "httpx.AsyncClient", url: str, body: bytes,
+                             request_id: str) -> RequestMetrics:
+    """make_request over an httpx client (the HTTP/2 transport)"""
+    start_time = time.perf_counter()
     
-    connector = aiohttp.TCPConnector(limit=10)
-    async with aiohttp.ClientSession(connector=connector) as session:
-        for request_num in range(config.requests_per_user):
-            metrics = await make_request(session, config, payload)
-            results.add_result(metrics)
-            
-            # Print progress
-            if request_num % 10 == 0:
-                print(f"[User {user_id}] Completed {request_num}/{config.requests_per_user} requests")
+    try:
+        async with client.stream("POST", url, content=body, headers={"X-Request-Id": request_id}) as response:
+            latency_ms = (time.perf_counter() - start_time) * 1000
+            raw = await response.aread()
+            error_msg = _error_message(raw) if response.status_code >= 400 else ""
             
-            # Small delay between requests
-            await asyncio.sleep(0.1)
+            return RequestMetrics(
+                status_code=response.status_code,
+                latency_ms=latency_ms,
+                success=200 <= response.status_code < 300,
+                error=error_msg,
+                request_id=request_id
+            )
+    
+    except httpx.TimeoutException:
+        latency_ms = (time.perf_counter() - start_time) * 1000
+        return RequestMetrics(
+            status_code=504,
+            latency_ms=latency_ms,
+            success=False,
+            error="Request timeout",
+            request_id=request_id
+        )
+    
+    except Exception as e:
+        latency_ms = (time.perf_counter() - start_time) * 1000
+        return RequestMetrics(
+            status_code=0,
+            latency_ms=latency_ms,
+            success=False,
+            error=str(e),
+            request_id=request_id
+        )
 
 
-async def run_stress_test(config: TestConfig) -> TestResults:
-    """Run the stress test"""
-    results = TestResults()
-    results.start_time = time.time()
+class RateLimiter:
+    """Pace callers to a fixed request rate
+    
+    Each wait() reserves the next free send slot, 1/rate seconds after the
+    previous one, and sleeps until it. Slots are reserved before the first
+    await, so concurrent callers on one event loop need no lock.
+    """
+    
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate
+        self.next_slot = 0.0
     
+    async def wait(self):
+        now = asyncio.get_running_loop().time()
+        slot = max(now, self.next_slot)
+        self.next_slot = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+async def limited_request(semaphore: asyncio.Semaphore, send: Callable[[bytes, str], Awaitable[RequestMetrics]],
+                          body: bytes, request_id: str,
+                          limiter: Optional[RateLimiter] = None) -> RequestMetrics:
+    """Make a request at its paced send time, once a concurrent_users slot is free"""
+    if limiter is not None:
+        await limiter.wait()
+    async with semaphore:
+        return await send(body, request_id)
+
+
+def create_client(config: TestConfig) -> Any:
+    """Build the pooled HTTP client for the configured transport
+    
+    Per-run constants (Content-Type, timeout) live on the client rather than
+    on every request.
+    """
+    pool_size = config.concurrent_users * 10
+    headers = {"Content-Type": "application/json"}
+    if config.transport == "httpx2":
+        return httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+            headers=headers,
+            timeout=config.timeout_seconds
+        )
+    
+    # One pooled session for all users so keep-alive connections are reused.
+    # The target host is resolved once and cached for the whole run; aiohttp
+    # resolves through aiodns (c-ares) rather than a thread pool when installed
+    connector = aiohttp.TCPConnector(
+        limit=pool_size,
+        limit_per_host=pool_size,
+        ttl_dns_cache=None,
+        keepalive_timeout=75
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        headers=headers,
+        timeout=aiohttp.ClientTimeout(total=config.timeout_seconds)
+    )
+
+
+def print_banner(config: TestConfig, processes: int = 1):
+    """Print the test configuration"""
     print(f"\n{'='*80}")
     print(f"Starting Stress Test")
     print(f"{'='*80}")
@@ -213,23 +390,172 @@ async def run_stress_test(config: TestConfig) -> TestResults:
     print(f"Concurrent Users: {config.concurrent_users}")
     print(f"Requests per User: {config.requests_per_user}")
     print(f"Payload Size: {config.payload_size} records")
+    if config.requests_per_second > 0:
+        print(f"Target Rate: {config.requests_per_second} req/sec")
     print(f"Expected Duration: ~{config.duration_seconds} seconds")
+    if processes > 1:
+        print(f"Worker Processes: {processes}")
     print(f"{'='*80}\n")
+
+
+async def progress_printer(results: TestResults, total: int, interval: float = 1.0):
+    """Print aggregate progress every interval seconds until cancelled"""
+    while True:
+        await asyncio.sleep(interval)
+        elapsed = time.perf_counter() - results.start_time
+        latencies = results.latencies
+        p95 = float(np.percentile(latencies, 95)) if len(latencies) else 0
+        print(f"Completed {results.total_requests}/{total} requests | "
+              f"{results.total_requests / elapsed:.0f} req/sec | p95 {p95:.1f}ms")
+
+
+async def progress_reporter(results: TestResults, slot: int, interval: float = 0.25):
+    """Publish this shard's completed count to the parent every interval seconds
     
-    # Create tasks for all users
-    tasks = [
-        user_session(user_id, config, results)
-        for user_id in range(config.concurrent_users)
-    ]
+    A report is a single store, so it runs more often than the parent prints
+    to keep the printed totals current.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        _shard_progress[slot] = results.total_requests
+
+
+def shard_progress_printer(counts, total: int, stop: threading.Event, interval: float = 1.0):
+    """Print the summed progress of all shards every interval seconds until stopped
     
-    # Run all user sessions concurrently
-    await asyncio.gather(*tasks)
+    Runs on a thread in the parent; latencies stay in the shards until they
+    finish, so only the count and rate are shown.
+    """
+    start_time = time.perf_counter()
+    while not stop.wait(interval):
+        completed = sum(counts)
+        elapsed = time.perf_counter() - start_time
+        print(f"Completed {completed}/{total} requests | {completed / elapsed:.0f} req/sec")
+
+
+# Per-shard completed counts, shared with the parent; set in each worker
+# process by _init_shard
+_shard_progress = None
+
+
+def _init_shard(counts):
+    """Process pool initializer: keep the shared progress array for the shard"""
+    global _shard_progress
+    _shard_progress = counts
+
+
+async def run_stress_test(config: TestConfig, shard: Optional[int] = None) -> TestResults:
+    """Run the stress test on the current event loop
     
-    results.end_time = time.time()
+    A standalone run prints its own progress; a shard instead reports its
+    count into its slot of the shared progress array for the parent to print.
+    """
+    results = TestResults()
+    results.start_time = time.perf_counter()
+    
+    url = f"{config.target_url}/api/analyze"
+    async with create_client(config) as client:
+        send = partial(make_httpx_request if config.transport == "httpx2" else make_request, client, url)
+        
+        # Each user slot keeps its own payload, as each simulated user did,
+        # serialized once rather than on every request
+        bodies = [
+            build_request_body(generate_test_payload(config.payload_size))
+            for _ in range(config.concurrent_users)
+        ]
+        total = config.concurrent_users * config.requests_per_user
+        
+        # Every request is scheduled up front; the semaphore caps in-flight
+        # requests at concurrent_users, and results are recorded as they finish
+        semaphore = asyncio.Semaphore(config.concurrent_users)
+        limiter = RateLimiter(config.requests_per_second) if config.requests_per_second > 0 else None
+        # Request ids are the task index, prefixed with the pid so that
+        # sharded runs never collide
+        id_prefix = f"stress-test-{os.getpid()}-"
+        tasks = [
+            asyncio.create_task(limited_request(
+                semaphore, send, bodies[i % config.concurrent_users], f"{id_prefix}{i}", limiter
+            ))
+            for i in range(total)
+        ]
+        
+        if shard is None:
+            progress = asyncio.create_task(progress_printer(results, total))
+        else:
+            progress = asyncio.create_task(progress_reporter(results, shard))
+        try:
+            for task in asyncio.as_completed(tasks):
+                results.add_result(await task)
+        finally:
+            progress.cancel()
+    
+    results.end_time = time.perf_counter()
     
     return results
 
 
+def run_shard(config: TestConfig, cpu: Optional[int] = None, shard: Optional[int] = None) -> TestResults:
+    """Run one shard of users on its own event loop (process pool entry point)
+    
+    With a cpu the process is first pinned to that core, so the scheduler
+    does not migrate the loop mid-run. Without a shard index the run is
+    standalone and prints its own progress.
+    """
+    if cpu is not None:
+        os.sched_setaffinity(0, {cpu})
+    if uvloop is not None:
+        return uvloop.run(run_stress_test(config, shard))
+    return asyncio.run(run_stress_test(config, shard))
+
+
+def run_sharded_stress_test(config: TestConfig, processes: int, pin_cpus: bool = False) -> TestResults:
+    """Split the users across worker processes and merge their results
+    
+    Each process drives its share of the users on its own event loop, so the
+    client is not capped by a single GIL-bound loop. With pin_cpus, shard i is
+    pinned to the i-th CPU this process may run on (Linux only).
+    """
+    processes = max(1, min(processes, config.concurrent_users))
+    cpus: List[Optional[int]] = [None] * processes
+    if pin_cpus and hasattr(os, "sched_getaffinity"):
+        allowed = sorted(os.sched_getaffinity(0))
+        cpus = [allowed[i % len(allowed)] for i in range(processes)]
+    
+    if processes == 1:
+        return run_shard(config, cpus[0])
+    
+    base, extra = divmod(config.concurrent_users, processes)
+    shards = []
+    for i in range(processes):
+        users = base + (i < extra)
+        # Each shard paces its proportional share of the target rate
+        rate = config.requests_per_second * users / config.concurrent_users
+        shards.append(replace(config, concurrent_users=users, requests_per_second=rate))
+    
+    # Shards only publish their counts; the parent prints one progress line
+    counts = multiprocessing.RawArray("q", processes)
+    stop = threading.Event()
+    printer = threading.Thread(
+        target=shard_progress_printer,
+        args=(counts, config.concurrent_users * config.requests_per_user, stop),
+        daemon=True,
+    )
+    
+    start_time = time.perf_counter()
+    printer.start()
+    try:
+        with ProcessPoolExecutor(max_workers=processes, initializer=_init_shard, initargs=(counts,)) as executor:
+            results = reduce(
+                TestResults.merge, executor.map(run_shard, shards, cpus, range(processes)), TestResults()
+            )
+    finally:
+        stop.set()
+        printer.join()
+    results.start_time = start_time
+    results.end_time = time.perf_counter()
+    return results
+
+
 def print_results(results: TestResults):
     """Print formatted test results"""
     summary = results.get_summary()
@@ -262,20 +588,37 @@ def print_results(results: TestResults):
     print(f"{'='*80}\n")
 
 
+LATENCY_FILE_DTYPE = '<f4'
+
+
 def save_results(results: TestResults, filename: str = "stress_test_results.json"):
-    """Save results to JSON file"""
+    """Save the summary to a JSON file and the raw latencies to a binary sidecar
+    
+    The sidecar holds one little-endian float32 (ms) per request and can be
+    loaded with numpy.fromfile(path, dtype='<f4').
+    """
     summary = results.get_summary()
     
+    latencies_file = f"{filename}.latencies.f4"
+    results.latencies.astype(LATENCY_FILE_DTYPE).tofile(latencies_file)
+    
     output = {
         "test_timestamp": datetime.now().isoformat(),
         "summary": summary,
-        "all_latencies": results.latencies
+        "latencies_file": latencies_file,
+        "latencies_dtype": LATENCY_FILE_DTYPE,
+        "latency_count": len(results.latencies)
     }
     
-    with open(filename, 'w') as f:
-        json.dump(output, f, indent=2)
+    if orjson is not None:
+        # status_codes is keyed by int; OPT_NON_STR_KEYS writes them as strings like json does
+        with open(filename, 'wb') as f:
+            f.write(orjson.dumps(output, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(filename, 'w') as f:
+            json.dump(output, f, indent=2)
     
-    print(f"Results saved to: {filename}")
+    print(f"Results saved to: {filename} (latencies: {latencies_file})")
 
 
 def main():
@@ -289,19 +632,34 @@ def main():
     parser.add_argument('--payload-size', type=int, default=100, help='Records per request')
     parser.add_argument('--timeout', type=int, default=30, help='Request timeout (seconds)')
     parser.add_argument('--output', default='stress_test_results.json', help='Output filename')
+    parser.add_argument('--rps', type=float, default=0,
+                        help='Target request rate across all users (default: unpaced)')
+    parser.add_argument('--transport', choices=['aiohttp', 'httpx2'], default='aiohttp',
+                        help='HTTP client: aiohttp (HTTP/1.1) or httpx2 (HTTP/2 via httpx)')
+    parser.add_argument('--pin-cpus', action='store_true',
+                        help='Pin each worker process to its own CPU (Linux only)')
+    parser.add_argument('--processes', type=int, default=os.cpu_count() or 1,
+                        help='Worker processes to shard users across (default: CPU count)')
     
     args = parser.parse_args()
+    if args.transport == 'httpx2' and httpx is None:
+        parser.error("--transport httpx2 requires httpx with HTTP/2 support (pip install 'httpx[http2]')")
     
     config = TestConfig(
         target_url=args.url,
         concurrent_users=args.users,
         requests_per_user=args.requests,
         payload_size=args.payload_size,
-        timeout_seconds=args.timeout
+        timeout_seconds=args.timeout,
+        requests_per_second=args.rps,
+        transport=args.transport
     )
     
+    processes = max(1, min(args.processes, config.concurrent_users))
+    print_banner(config, processes)
+    
     # Run the test
-    results = asyncio.run(run_stress_test(config))
+    results = run_sharded_stress_test(config, processes, args.pin_cpus)
     
     # Print and save results
     print_results(results)